@@ -0,0 +1,35 @@
+"""Benchmark: how many recorded screens per second the panel classifier can identify."""
+
+import random
+import sys
+import time
+
+sys.path.insert(0, __file__.rsplit("benchmarks", 1)[0])
+
+from bzio.emulator import screen_text  # noqa: E402
+from bzio.panels import PanelClassifier  # noqa: E402
+
+PANELS = ["STAT/MEMB", "STAT/JOBS", "STAT/ADDR", "STAT/REVW", "CASE/NOTE", "CASE/CURR", "ELIG/FS", "SELF"]
+
+
+def sample_screen(panel, case_number, error=""):
+    """Build a screen with a fixed header for panel and varying case data below it."""
+    rows = ["", "%s panel" % panel, "Function: %s" % panel.split("/")[0]]
+    rows += ["Case Nbr: %08d  field %d" % (case_number, n) for n in range(20)]
+    rows.append(" " + error)
+    return screen_text(rows)
+
+
+def main(count=20000):
+    classifier = PanelClassifier()
+    for panel in PANELS:
+        classifier.register(panel, sample_screen(panel, 1), function=panel.split("/")[0])
+    screens = [sample_screen(random.choice(PANELS), random.randint(1, 99999999)) for _ in range(count)]
+    started = time.perf_counter()
+    unknown = sum(1 for screen in screens if classifier.classify(screen).panel is None)
+    elapsed = time.perf_counter() - started
+    print("Classified %d screens in %.3f s: %.0f screens/s (%d unknown)" % (count, elapsed, count / elapsed, unknown))
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,51 @@
+"""Benchmark: how many stored screens per second extract() can pull a panel's fields from."""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, __file__.rsplit("benchmarks", 1)[0])
+
+from bzio import extract  # noqa: E402
+from bzio.archive import ScreenArchive  # noqa: E402
+from bzio.emulator import screen_text  # noqa: E402
+
+LAYOUT = {
+    "case_number": (4, 11, 8),
+    "member": (5, 11, 2),
+    "employer": (7, 11, 30),
+    "income": (12, 40, 10),
+    "status": (24, 2, 40),
+}
+
+
+def sample_screen(case_number):
+    rows = ["", "STAT/JOBS panel", "Function: STAT"]
+    rows.append("Case Nbr: %08d" % case_number)
+    rows.append("Member:   %02d" % random.randint(1, 9))
+    rows += ["", "Employer: EMPLOYER %d" % random.randint(1, 500)] + [""] * 4
+    rows.append("%39s %10.2f" % ("", random.random() * 5000))
+    rows += [""] * 11 + [" ENTER A VALID COMMAND OR PF-KEY" if random.random() < 0.1 else ""]
+    return screen_text(rows)
+
+
+def main(count=100000):
+    # The archive is about 200 MB at the default count, so it goes once the run is over.
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "screens.bza")
+        with ScreenArchive(path) as archive:
+            for _ in range(count):
+                case_number = random.randint(1, 99999999)
+                archive.append(sample_screen(case_number), case_number=case_number)
+        with ScreenArchive(path) as archive:
+            started = time.perf_counter()
+            table = extract.extract(archive, LAYOUT)
+            elapsed = time.perf_counter() - started
+    print("Extracted %d fields from %d screens in %.3f s: %.0f screens/s (%s)"
+          % (len(LAYOUT), len(table), elapsed, len(table) / elapsed, "numpy" if extract.numpy is not None else "pure Python"))
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,163 @@
+"""BlueZone I/O functions for Python."""
+
+from . import backends
+from .screen import COLS, ROWS, SCREEN_SIZE, Screen, stats
+from .session import POLL_BACKOFF, POLL_FIRST, POLL_MAX, PendingScreen, Session
+
+# The host every function below talks to. Nothing is dispatched until the first host call; see use_backend().
+connection = backends.Connection()
+
+# The functions below all act on this session; see session.Session for driving more than one screen.
+default_session = Session(connection=connection)
+
+# How long the host took per transaction, recorded by Transmit and the wait_for_* functions.
+transaction_latency = default_session.transaction_latency
+
+
+def Connect(screen_to_connect):
+    """Connect to a BlueZone Screen."""
+    default_session.Connect(screen_to_connect)
+
+
+def Focus():
+    """Bring the BlueZone Display session window into the foreground."""
+    default_session.Focus()
+
+
+def CursorCol():
+    """Return current cursor column of the connected BZ screen."""
+    return default_session.CursorCol()
+
+
+def CursorRow():
+    """Return current cursor row of the connected BZ screen."""
+    return default_session.CursorRow()
+
+
+def GetCursor():
+    """Return the cursor position as (row, column), in one host call instead of CursorRow() plus CursorCol()."""
+    return default_session.GetCursor()
+
+
+def MsgBox(message_to_deliver):
+    """Display a simple pop-up box from within the BlueZone window."""
+    default_session.MsgBox(message_to_deliver)
+
+
+def ReadScreen(LengthVal, RowVal, ColumnVal):
+    """Retrieve data from the host screen."""
+    return default_session.ReadScreen(LengthVal, RowVal, ColumnVal)
+
+
+def Search(SearchStr):
+    """Search the host screen for some specified text."""
+    return default_session.Search(SearchStr)
+
+
+def SendKey(KeyStr):
+    """Send a sequence of keys to the display session."""
+    default_session.SendKey(KeyStr)
+
+
+def SetCursor(RowVal, ColumnVal):
+    """Set the host screen cursor position."""
+    default_session.SetCursor(RowVal, ColumnVal)
+
+
+def Snapshot():
+    """Capture the whole host screen and cursor position so many fields can be read from one host round trip."""
+    return default_session.Snapshot()
+
+
+def Transmit():
+    """Send a transmit key and wait until the window refreshes."""
+    default_session.Transmit()
+
+
+def WaitReady(TimeoutVal, ExtraWaitVal):
+    """Suspend script execution until the host screen is ready for keyboard input."""
+    default_session.WaitReady(TimeoutVal, ExtraWaitVal)
+
+
+def WriteScreen(WriteStr, RowVal, ColumnVal):
+    """Paste the specified text into the host screen."""
+    default_session.WriteScreen(WriteStr, RowVal, ColumnVal)
+
+
+def read_text():
+    """Return the whole screen text in one host call, bypassing the read cache; Snapshot also reads the cursor."""
+    return default_session.read_text()
+
+
+def search_screen(patterns):
+    """Find every position of several strings with one screen read, instead of a Search call per string.
+
+    patterns is a search.PatternSet (build it once for patterns checked often) or any iterable of strings.
+    Returns {pattern: [(row, col), ...]}.
+    """
+    return default_session.search_screen(patterns)
+
+
+def wait_for_text(text, row=None, col=None, timeout=30.0):
+    """Wait until text is on the screen, at (row, col) if given or anywhere in row if only row is given.
+
+    Returns the seconds waited, or raises TimeoutError.
+    """
+    return default_session.wait_for_text(text, row, col, timeout)
+
+
+def wait_for_change(since=None, timeout=30.0):
+    """Wait until the screen differs from since (a Screen or screen text, default the screen right now).
+
+    Returns the seconds waited, or raises TimeoutError.
+    """
+    return default_session.wait_for_change(since, timeout)
+
+
+def transmit_until(text, row=None, col=None, timeout=30.0):
+    """Transmit, then wait for text the same way wait_for_text does instead of a fixed WaitReady(0, 0)."""
+    return default_session.transmit_until(text, row, col, timeout)
+
+
+def write_batch(key="<enter>", verify=True):
+    """Queue field writes in a with block and send them together, then key, then check the fields were kept.
+
+    See batch.WriteBatch.
+    """
+    return default_session.write_batch(key, verify)
+
+
+def send_ahead(key="<enter>"):
+    """Send key without waiting for the host, and return a session.PendingScreen whose result() waits for the new screen.
+
+    Local work done in between overlaps the host's processing; any other bzio call waits for the host first.
+    """
+    return default_session.send_ahead(key)
+
+
+def use_backend(new_backend):
+    """Send every bzio call to new_backend, e.g. an emulator.Emulator, and return the previous backend."""
+    return default_session.use_backend(new_backend)
+
+
+def enable_cache(enabled=True):
+    """Turn the read cache for ReadScreen, CursorRow and CursorCol on or off."""
+    default_session.enable_cache(enabled)
+
+
+def caching():
+    """Enable the read cache for the duration of a with block."""
+    return default_session.caching()
+
+
+def cache_stats():
+    """Return read cache hits, misses and hit rate, to show how many host round trips were saved."""
+    hits, misses = stats["cache_hits"], stats["cache_misses"]
+    total = hits + misses
+    return {"hits": hits, "misses": misses, "hit_rate": hits / total if total else 0.0}
+
+
+def calls_avoided():
+    """Return how many host calls the script's own snapshot reads have saved so far."""
+    # Each snapshot costs two host calls (the screen and the cursor).
+    return stats["snapshot_reads"] - 2 * stats["snapshots"]
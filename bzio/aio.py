@@ -0,0 +1,117 @@
+"""asyncio front-end for bzio: host calls run on one thread per session, so an event loop can overlap them with local work.
+
+Example::
+
+    async def main():
+        async with AsyncSession("A") as a, AsyncSession("B") as b:
+            await asyncio.gather(a.transmit(), b.transmit(), write_results())
+            print(await a.read(8, 4, 30))
+"""
+
+import asyncio
+import concurrent.futures
+import time
+
+from .backends import enter_apartment, leave_apartment
+from .session import Session
+from .watch import ScreenWatcher
+
+
+class AsyncSession(object):
+    """Awaitable version of session.Session.
+
+    Every call is marshalled onto a single thread owned by this session. Its BlueZone automation object is created
+    on that thread too, because COM objects belong to the apartment of the thread that created them.
+    """
+
+    def __init__(self, screen_to_connect=None, backend=None, session=None):
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        self._executor.submit(enter_apartment)
+        self.session = session if session is not None else Session(backend=backend)
+        self._screen_to_connect = screen_to_connect
+
+    async def __aenter__(self):
+        if self._screen_to_connect is not None:
+            await self.connect(self._screen_to_connect)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    def _call(self, method, *args):
+        return asyncio.get_event_loop().run_in_executor(self._executor, method, *args)
+
+    async def close(self):
+        """Release the session thread once its queued calls are done."""
+        await self._call(leave_apartment)
+        self._executor.shutdown(wait=False)
+
+    async def connect(self, screen_to_connect):
+        return await self._call(self.session.Connect, screen_to_connect)
+
+    async def focus(self):
+        return await self._call(self.session.Focus)
+
+    async def cursor(self):
+        """Return the cursor position as (row, col)."""
+        return await self._call(self.session.GetCursor)
+
+    async def msg_box(self, message_to_deliver):
+        return await self._call(self.session.MsgBox, message_to_deliver)
+
+    async def read(self, length, row, col):
+        return await self._call(self.session.ReadScreen, length, row, col)
+
+    async def search(self, text):
+        return await self._call(self.session.Search, text)
+
+    async def search_screen(self, patterns):
+        return await self._call(self.session.search_screen, patterns)
+
+    async def send_key(self, keys):
+        return await self._call(self.session.SendKey, keys)
+
+    async def set_cursor(self, row, col):
+        return await self._call(self.session.SetCursor, row, col)
+
+    async def snapshot(self):
+        return await self._call(self.session.Snapshot)
+
+    async def transmit(self):
+        return await self._call(self.session.Transmit)
+
+    async def transmit_until(self, text, row=None, col=None, timeout=30.0):
+        return await self._call(self.session.transmit_until, text, row, col, timeout)
+
+    async def wait_ready(self, timeout=0, extra_wait=0):
+        return await self._call(self.session.WaitReady, timeout, extra_wait)
+
+    async def wait_for_text(self, text, row=None, col=None, timeout=30.0):
+        return await self._call(self.session.wait_for_text, text, row, col, timeout)
+
+    async def wait_for_change(self, since=None, timeout=30.0):
+        return await self._call(self.session.wait_for_change, since, timeout)
+
+    async def write(self, text, row, col):
+        return await self._call(self.session.WriteScreen, text, row, col)
+
+    async def changes(self, classifier=None, rows=None, timeout=None):
+        """Yield watch.ScreenChange events as the screen changes, sleeping on the event loop between polls.
+
+        Stops once no change comes for timeout seconds (None never stops); see watch.ScreenWatcher.
+        """
+        watcher = ScreenWatcher(self.session, classifier, rows)
+        idle_since = time.perf_counter()
+        while True:
+            change = await self._call(watcher.poll)
+            if change is not None:
+                yield change
+                idle_since = time.perf_counter()
+                continue
+            delay = watcher.next_delay()
+            if timeout is not None:
+                remaining = idle_since + timeout - time.perf_counter()
+                if remaining <= 0:
+                    return
+                delay = min(delay, remaining)
+            await asyncio.sleep(delay)
@@ -0,0 +1,223 @@
+"""Fixed-width, memory-mapped archive of captured screens, indexed by case number, panel and time.
+
+Each screen takes one record: the 1920 screen bytes followed by a small metadata block. Reads go straight to
+the memory map, and the side index (kept in "<path>.idx") answers queries without touching screen data::
+
+    archive = ScreenArchive("screens.bza", classifier=classifier)
+    archive.append(bzio.Snapshot(), case_number="123456")
+    for record in archive.records(archive.find(case_from="100000", case_to="199999", panel="STAT/JOBS")):
+        print(record.case_number, record.screen.row(4))
+"""
+
+import array
+import bisect
+import collections
+import mmap
+import os
+import pickle
+import struct
+import time
+
+from .screen import SCREEN_SIZE, Screen
+
+# Metadata after each screen: timestamp, case number, fingerprint (hex digest as bytes), panel name, cursor.
+# The three text slots are SLOT_SIZE bytes each.
+SLOT_SIZE = 16
+_META = struct.Struct("<d%ds%ds%dsBB" % (SLOT_SIZE, SLOT_SIZE, SLOT_SIZE))
+RECORD_SIZE = SCREEN_SIZE + _META.size
+
+ENCODING = "latin-1"
+
+ArchivedScreen = collections.namedtuple("ArchivedScreen", "number timestamp case_number fingerprint panel screen")
+
+
+def case_key(case_number):
+    """Sort key for a case number: numeric case numbers sort by value, whatever their padding."""
+    return str(case_number).strip().rjust(16, "0")
+
+
+class ScreenArchive(object):
+    """Append-only file of screen records with an index by case number, panel fingerprint and timestamp.
+
+    classifier is an optional panels.PanelClassifier used to fill in the panel and fingerprint of new screens.
+    """
+
+    def __init__(self, path, classifier=None):
+        self.path = path
+        self.classifier = classifier
+        self._file = open(path, "a+b")
+        self._map = None
+        self._reset_index()
+        self._load_index()
+        self._index_from(len(self._timestamps))
+
+    def __len__(self):
+        return len(self._timestamps)
+
+    def close(self):
+        """Write the side index and release the file."""
+        self._save_index()
+        self._release_map()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def append(self, screen, case_number="", panel=None, fingerprint=None, timestamp=None):
+        """Store a Screen (or screen text) and return its record number."""
+        text = screen.text if isinstance(screen, Screen) else screen.ljust(SCREEN_SIZE)[:SCREEN_SIZE]
+        cursor = screen.cursor if isinstance(screen, Screen) else (1, 1)
+        if self.classifier is not None and (panel is None or fingerprint is None):
+            found = self.classifier.classify(text)
+            panel = found.panel if panel is None else panel
+            fingerprint = found.fingerprint if fingerprint is None else fingerprint
+        timestamp = time.time() if timestamp is None else timestamp
+        case_bytes = str(case_number).strip().encode("ascii")
+        fingerprint_bytes = (fingerprint or "").encode("ascii")
+        panel_bytes = (panel or "").encode(ENCODING)
+        for name, value in (("case number", case_bytes), ("fingerprint", fingerprint_bytes), ("panel", panel_bytes)):
+            if len(value) > SLOT_SIZE:
+                raise ValueError("The %s %r is longer than the %d characters a record holds." % (name, value.decode(ENCODING), SLOT_SIZE))
+        meta = _META.pack(timestamp, case_bytes, fingerprint_bytes, panel_bytes, cursor[0], cursor[1])
+        self._file.seek(0, os.SEEK_END)
+        self._file.write(text.encode(ENCODING, "replace") + meta)
+        self._file.flush()
+        number = len(self._timestamps)
+        self._index(number, timestamp, case_number, fingerprint, panel)
+        return number
+
+    def raw(self, number):
+        """Return a zero-copy memoryview of one record's screen bytes."""
+        start = self._offset(number)
+        return memoryview(self._mapped())[start:start + SCREEN_SIZE]
+
+    def record(self, number):
+        """Return one record as an ArchivedScreen."""
+        start = self._offset(number)
+        data = self._mapped()
+        timestamp, case_number, fingerprint, panel, row, col = _META.unpack_from(data, start + SCREEN_SIZE)
+        screen = Screen(data[start:start + SCREEN_SIZE].decode(ENCODING), (row, col))
+        return ArchivedScreen(number, timestamp, _text(case_number), _text(fingerprint) or None, _text(panel) or None, screen)
+
+    def records(self, numbers):
+        """Yield ArchivedScreens for a list of record numbers."""
+        for number in numbers:
+            yield self.record(number)
+
+    def find(self, case_from=None, case_to=None, panel=None, fingerprint=None, since=None, until=None):
+        """Return the sorted record numbers matching every condition given; case and time ranges are inclusive."""
+        matches = None
+        if fingerprint is not None:
+            matches = set(self._by_fingerprint.get(fingerprint, ()))
+        if panel is not None:
+            matches = _narrow(matches, self._by_panel.get(panel, ()))
+        if case_from is not None or case_to is not None:
+            matches = _narrow(matches, self._case_range(case_from, case_to))
+        if since is not None or until is not None:
+            matches = _narrow(matches, self._time_range(since, until))
+        if matches is None:
+            return list(range(len(self)))
+        return sorted(matches)
+
+    def _case_range(self, case_from, case_to):
+        if not self._by_case_sorted:
+            self._by_case.sort()
+            self._by_case_sorted = True
+        low = bisect.bisect_left(self._by_case, (case_key(case_from), -1)) if case_from is not None else 0
+        high = bisect.bisect_right(self._by_case, (case_key(case_to), len(self))) if case_to is not None else len(self._by_case)
+        return [number for key, number in self._by_case[low:high]]
+
+    def _time_range(self, since, until):
+        stamps = self._timestamps
+        if self._times_sorted:
+            low = bisect.bisect_left(stamps, since) if since is not None else 0
+            high = bisect.bisect_right(stamps, until) if until is not None else len(stamps)
+            return range(low, high)
+        return [number for number, stamp in enumerate(stamps)
+                if (since is None or stamp >= since) and (until is None or stamp <= until)]
+
+    def _offset(self, number):
+        if not 0 <= number < len(self):
+            raise IndexError("There is no record %d in %s." % (number, self.path))
+        return number * RECORD_SIZE
+
+    def _mapped(self):
+        """Return a memory map covering every record, remapping after appends."""
+        size = len(self) * RECORD_SIZE
+        if self._map is None or len(self._map) < size:
+            self._release_map()
+            self._map = mmap.mmap(self._file.fileno(), size, access=mmap.ACCESS_READ)
+        return self._map
+
+    def _release_map(self):
+        """Drop the current map; one still exported through raw() views is left for them to keep alive."""
+        if self._map is not None:
+            try:
+                self._map.close()
+            except BufferError:
+                pass
+            self._map = None
+
+    def _index(self, number, timestamp, case_number, fingerprint, panel):
+        key = case_key(case_number)
+        if self._by_case and self._by_case_sorted and key < self._by_case[-1][0]:
+            self._by_case_sorted = False
+        self._by_case.append((key, number))
+        if fingerprint:
+            self._by_fingerprint.setdefault(fingerprint, array.array("L")).append(number)
+        if panel:
+            self._by_panel.setdefault(panel, array.array("L")).append(number)
+        if self._timestamps and timestamp < self._timestamps[-1]:
+            self._times_sorted = False
+        self._timestamps.append(timestamp)
+
+    def _index_from(self, first):
+        """Index records on disk that the side index does not cover yet (e.g. after a crash)."""
+        self._file.seek(0, os.SEEK_END)
+        count = self._file.tell() // RECORD_SIZE
+        if count < first:
+            # The index describes more records than the file holds, so it belongs to some other file; start over.
+            self._reset_index()
+            first = 0
+        if count <= first:
+            return
+        data = mmap.mmap(self._file.fileno(), count * RECORD_SIZE, access=mmap.ACCESS_READ)
+        try:
+            for number in range(first, count):
+                timestamp, case_number, fingerprint, panel, row, col = _META.unpack_from(data, number * RECORD_SIZE + SCREEN_SIZE)
+                self._index(number, timestamp, _text(case_number), _text(fingerprint), _text(panel))
+        finally:
+            data.close()
+
+    def _reset_index(self):
+        self._by_case = []
+        self._by_case_sorted = True
+        self._by_fingerprint = {}
+        self._by_panel = {}
+        self._timestamps = array.array("d")
+        self._times_sorted = True
+
+    def _load_index(self):
+        try:
+            with open(self.path + ".idx", "rb") as f:
+                saved = pickle.load(f)
+        except (IOError, OSError, EOFError, pickle.UnpicklingError):
+            return
+        self._by_case, self._by_fingerprint, self._by_panel, self._timestamps, self._times_sorted = saved
+        self._by_case_sorted = False
+
+    def _save_index(self):
+        with open(self.path + ".idx", "wb") as f:
+            saved = (self._by_case, self._by_fingerprint, self._by_panel, self._timestamps, self._times_sorted)
+            pickle.dump(saved, f, pickle.HIGHEST_PROTOCOL)
+
+
+def _text(raw):
+    return raw.rstrip(b"\0").decode(ENCODING)
+
+
+def _narrow(matches, numbers):
+    return set(numbers) if matches is None else matches.intersection(numbers)
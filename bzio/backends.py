@@ -0,0 +1,175 @@
+"""Host backends that the bzio functions talk to."""
+
+# The BZWhll.WhllObj automation object, shared by every ComBackend in the process; see dispatch().
+_dispatch = None
+
+
+def dispatch():
+    """Return the process-wide BlueZone automation object, creating it on first use."""
+    global _dispatch
+    if _dispatch is None:
+        _dispatch = new_dispatch()
+    return _dispatch
+
+
+def new_dispatch():
+    """Create a BlueZone automation object of its own, for a session that must not share one."""
+    # Imported here rather than at the top: pywin32 is slow to load and only exists on Windows desktops with BlueZone.
+    try:
+        import win32com.client
+    except ImportError:
+        raise RuntimeError("BlueZone automation needs pywin32 on a Windows desktop with BlueZone installed.")
+    return win32com.client.Dispatch("BZWhll.WhllObj")
+
+
+def enter_apartment():
+    """Initialise COM on the current thread, when pywin32 is installed, before it creates a BlueZone object."""
+    try:
+        import pythoncom
+    except ImportError:
+        return
+    pythoncom.CoInitialize()
+
+
+def leave_apartment():
+    """Undo enter_apartment() on the current thread."""
+    try:
+        import pythoncom
+    except ImportError:
+        return
+    pythoncom.CoUninitialize()
+
+
+class Backend(object):
+    """Operations every bzio host backend provides.
+
+    Rows and columns are 1-based, as in BlueZone.
+    """
+
+    def connect(self, screen_to_connect):
+        """Attach to a host session."""
+        raise NotImplementedError
+
+    def focus(self):
+        """Bring the session window into the foreground, if there is one."""
+
+    def msg_box(self, message):
+        """Show a message to the user."""
+        raise NotImplementedError
+
+    def read_screen(self, length, row, col):
+        """Return length characters from (row, col), raising ValueError if that is off the screen."""
+        raise NotImplementedError
+
+    def write_screen(self, text, row, col):
+        """Paste text into the screen at (row, col)."""
+        raise NotImplementedError
+
+    def send_key(self, keys):
+        """Send keystrokes and mnemonics such as <enter> or <pf8>."""
+        raise NotImplementedError
+
+    def wait_ready(self, timeout, extra_wait):
+        """Block until the host is ready for keyboard input."""
+        raise NotImplementedError
+
+    def search(self, text):
+        """Find text on the screen, returning (0, row, col) when found and a non-zero code first when not."""
+        raise NotImplementedError
+
+    def get_cursor(self):
+        """Return the cursor position as (row, col)."""
+        raise NotImplementedError
+
+    def set_cursor(self, row, col):
+        """Move the cursor to (row, col)."""
+        raise NotImplementedError
+
+
+class ComBackend(Backend):
+    """BlueZone desktop emulator, driven through its BZWhll.WhllObj COM automation object.
+
+    The automation object is not created until the first host call; pass bz to use a specific one. Backends
+    share the process-wide object unless shared is False.
+    """
+
+    def __init__(self, bz=None, shared=True):
+        self._bz = bz
+        self.shared = shared
+
+    @property
+    def bz(self):
+        if self._bz is None:
+            self._bz = dispatch() if self.shared else new_dispatch()
+        return self._bz
+
+    def connect(self, screen_to_connect):
+        self.bz.connect(screen_to_connect)
+
+    def focus(self):
+        self.bz.Focus()
+
+    def msg_box(self, message):
+        self.bz.MsgBox(message)
+
+    def read_screen(self, length, row, col):
+        ret_details = self.bz.ReadScreen("", length, row, col)
+        # ret_details is a list with two items, 0 (any error code, 0 for success), and 1 (the text it read from BZ)
+        if ret_details[0] != 0:
+            raise ValueError("Either the row or column variable are too high.")
+        return ret_details[1]
+
+    def write_screen(self, text, row, col):
+        self.bz.WriteScreen(text, row, col)
+
+    def send_key(self, keys):
+        self.bz.SendKey(keys)
+
+    def wait_ready(self, timeout, extra_wait):
+        self.bz.WaitReady(timeout, extra_wait)
+
+    def search(self, text):
+        return self.bz.Search(text, 1, 1)
+
+    def get_cursor(self):
+        ret_details = self.bz.GetCursor(0, 0)
+        return ret_details[1], ret_details[2]
+
+    def set_cursor(self, row, col):
+        self.bz.SetCursor(row, col)
+
+
+class Connection(object):
+    """Connect state for the bzio functions: the backend in use and the session it is attached to.
+
+    The backend is only built when the first host call needs it, so importing bzio never touches BlueZone.
+    """
+
+    def __init__(self, backend_factory=ComBackend):
+        self.backend_factory = backend_factory
+        self.backend = None
+        self.session = None
+        self.connects = 0
+
+    @property
+    def is_started(self):
+        """Whether a backend has been created yet."""
+        return self.backend is not None
+
+    def host(self):
+        """Return the backend, creating it on first use."""
+        if self.backend is None:
+            self.backend = self.backend_factory()
+        return self.backend
+
+    def connect(self, screen_to_connect):
+        """Attach the backend to a session, reusing the same backend for every session."""
+        self.host().connect(screen_to_connect)
+        self.session = screen_to_connect
+        self.connects += 1
+
+    def use(self, backend):
+        """Replace the backend, returning the previous one (which may be None if it was never started)."""
+        previous, self.backend = self.backend, backend
+        self.session = None
+        return previous
@@ -0,0 +1,136 @@
+"""Collect the field writes for a panel and send them together, with one transmit at the end.
+
+Example::
+
+    with bzio.write_batch() as batch:
+        batch.write("JOBS", 20, 71)
+        batch.write(case_number, 20, 38)
+        batch.write("01", 20, 76)
+    # The writes were sent and checked with one screen read, then the panel transmitted once.
+"""
+
+import collections
+
+from .screen import COLS, SCREEN_SIZE, Screen, screen_offset
+
+Write = collections.namedtuple("Write", "text row col")
+
+
+class WriteError(RuntimeError):
+    """Fields written by a batch were not on the screen.
+
+    rejected holds (Write, text found in its place) pairs and screen the text they were checked against, as a Screen
+    (the cursor is not read, so it shows as 1,1).
+    """
+
+    def __init__(self, rejected, screen):
+        fields = ", ".join("%r at %d,%d (found %r)" % (write.text, write.row, write.col, found) for write, found in rejected)
+        super(WriteError, self).__init__("The host did not keep %s." % fields)
+        self.rejected = rejected
+        self.screen = screen
+
+
+class WriteBatch(object):
+    """Field writes for one session, held until commit().
+
+    Writes to the same spot keep only the last text, and writes that touch end to end are sent as one WriteScreen.
+    key is the key sent after the writes (None to send none). verify checks the written fields with one screen read
+    before the key. verify="answer" also checks them on the host's answer, at the cost of a second read, when that
+    is still the same panel, e.g. after the host blanked a field it refused. Used as a context manager, the batch
+    commits when the block ends and is dropped if it raises.
+    """
+
+    def __init__(self, session, key="<enter>", verify=True):
+        self.session = session
+        self.key = key
+        self.verify = verify
+        self.writes = []
+        self.cursor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+
+    def write(self, text, row, col):
+        """Queue text to be written at (row, col)."""
+        text = str(text)
+        screen_offset(len(text), row, col)
+        self.writes.append(Write(text, row, col))
+
+    def set_cursor(self, row, col):
+        """Leave the cursor at (row, col) before the key is sent."""
+        screen_offset(0, row, col)
+        self.cursor = (row, col)
+
+    # Aliases so code written against the module-level functions can queue into a batch unchanged.
+    WriteScreen = write
+    SetCursor = set_cursor
+
+    def runs(self):
+        """Return the coalesced writes that commit() will send, in screen order."""
+        overlay = {}
+        for text, row, col in self.writes:
+            start = screen_offset(len(text), row, col)
+            for offset, char in enumerate(text, start):
+                overlay[offset] = char
+        runs = []
+        for offset in sorted(overlay):
+            if runs and runs[-1][0] + len(runs[-1][1]) == offset:
+                runs[-1][1].append(overlay[offset])
+            else:
+                runs.append((offset, [overlay[offset]]))
+        return [Write("".join(chars), offset // COLS + 1, offset % COLS + 1) for offset, chars in runs]
+
+    def commit(self):
+        """Send the writes, the cursor move and the key, then verify; returns how many host calls the writes took."""
+        runs = self.runs()
+        cursor, self.cursor = self.cursor, None
+        self.writes = []
+        for text, row, col in runs:
+            self.session.WriteScreen(text, row, col)
+        if cursor is not None:
+            self.session.SetCursor(*cursor)
+        typed = None
+        if self.verify and runs:
+            # Checked before the key, since the answer is often another panel where the fields are gone. Only the
+            # text is needed, so this is one read_screen and no cursor read.
+            typed = self.session.read_text()
+            _check(runs, typed)
+        if self.key == "<enter>":
+            self.session.Transmit()
+        elif self.key:
+            self.session.SendKey(self.key)
+            self.session.WaitReady(0, 0)
+        if typed is not None and self.key and self.verify == "answer":
+            answer = self.session.read_text()
+            if _same_panel(typed, answer, runs):
+                _check(runs, answer)
+        return len(runs)
+
+
+def _check(runs, text):
+    """Raise WriteError for the writes that are not in the screen text."""
+    rejected = []
+    for write in runs:
+        # The host may upper-case or re-pad what was typed, so only the text itself has to match.
+        start = screen_offset(len(write.text), write.row, write.col)
+        found = text[start:start + len(write.text)]
+        if found.strip().upper() != write.text.strip().upper():
+            rejected.append((write, found))
+    if rejected:
+        raise WriteError(rejected, Screen(text))
+
+
+def _same_panel(before, after, runs):
+    """Whether the screen text after is the panel before was, leaving out the written fields and the message line."""
+    texts = []
+    for text in (before, after):
+        text = list(text[:SCREEN_SIZE - COLS])
+        for write in runs:
+            start = screen_offset(len(write.text), write.row, write.col)
+            text[start:start + len(write.text)] = " " * len(write.text)
+        texts.append("".join(text[:SCREEN_SIZE - COLS]))
+    return texts[0] == texts[1]
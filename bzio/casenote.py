@@ -0,0 +1,122 @@
+"""Lay out a CASE/NOTE offline, then enter it a page at a time.
+
+Example::
+
+    note = CaseNote("Phone call from client re: renewal")
+    note.bullet("Phone number", phone_number)
+    note.bullet("Actions taken", actions_taken)      # skipped when blank
+    note.item("Follow-up is needed.")
+    note.line("---")
+    note.line(worker_signature)
+    NoteWriter().write(note)
+
+Long entries wrap at the note width, with bullets hanging under their text. Each page is written as one
+batch.WriteBatch, so a note costs one transmit per page instead of host reads and waits per line.
+"""
+
+import textwrap
+
+import bzio
+
+# Where note text goes on the MAXIS CASE/NOTE edit screen.
+NOTE_FIRST_ROW = 4
+NOTE_LAST_ROW = 17
+NOTE_COL = 3
+NOTE_WIDTH = 74
+
+
+class CaseNote(object):
+    """The lines of a note before they are wrapped: plain lines, "* label: value" bullets and "* text" items."""
+
+    def __init__(self, header=None):
+        self.entries = []
+        if header:
+            self.line(header)
+
+    def __str__(self):
+        return "\n".join(self.lines())
+
+    def line(self, text):
+        """Add a line of text as it is."""
+        self.entries.append((str(text), 0))
+        return self
+
+    def bullet(self, label, value):
+        """Add "* label: value", with wrapped lines lined up under the value; blank values are left out."""
+        value = str(value).strip() if value is not None else ""
+        if value:
+            prefix = "* %s: " % label
+            self.entries.append((prefix + value, len(prefix)))
+        return self
+
+    def item(self, text):
+        """Add "* text", with wrapped lines lined up under the text."""
+        self.entries.append(("* %s" % text, 2))
+        return self
+
+    def lines(self, width=NOTE_WIDTH):
+        """Return the note wrapped to width, one string per note line."""
+        lines = []
+        for text, hang in self.entries:
+            # A long label would leave no room for the value, so never hang more than half the line.
+            wrapper = textwrap.TextWrapper(width, subsequent_indent=" " * min(hang, width // 2))
+            for paragraph in text.splitlines() or [""]:
+                lines.extend(wrapper.wrap(paragraph) or [""])
+        return lines
+
+
+def paginate(lines, per_page):
+    """Split note lines into pages of per_page lines."""
+    return [lines[start:start + per_page] for start in range(0, len(lines), per_page)]
+
+
+class NoteWriter(object):
+    """Enters notes on the CASE/NOTE screen of a session (the module-level bzio session by default).
+
+    open_key starts a new note (None if one is already open), page_key moves to the next page and save_key saves
+    the note at the end. With verify, each page is checked on the screen before moving on.
+    """
+
+    def __init__(self, session=None, first_row=NOTE_FIRST_ROW, last_row=NOTE_LAST_ROW, col=NOTE_COL, width=NOTE_WIDTH,
+                 open_key="<pf9>", page_key="<pf8>", save_key="<pf3>", verify=True):
+        self.session = session if session is not None else bzio
+        self.first_row = first_row
+        self.col = col
+        self.width = width
+        self.per_page = last_row - first_row + 1
+        self.open_key = open_key
+        self.page_key = page_key
+        self.save_key = save_key
+        self.verify = verify
+
+    def pages(self, note):
+        """Lay out a CaseNote, a list of lines or a string into pages, without touching the host."""
+        if isinstance(note, str):
+            note = note.splitlines()
+        if not isinstance(note, CaseNote):
+            note = CaseNote().line("\n".join(note))
+        return paginate(note.lines(self.width), self.per_page)
+
+    def write(self, note):
+        """Enter and save a note; returns the number of keys sent to the host."""
+        pages = self.pages(note)
+        if not pages:
+            return 0
+        sent = 0
+        if self.open_key:
+            self._press(self.open_key)
+            sent += 1
+        for number, page in enumerate(pages):
+            with self.session.write_batch(key=None, verify=self.verify) as batch:
+                for row, text in enumerate(page, self.first_row):
+                    if text.strip():
+                        batch.write(text, row, self.col)
+            key = self.page_key if number < len(pages) - 1 else self.save_key
+            if key:
+                self._press(key)
+                sent += 1
+        return sent
+
+    def _press(self, key):
+        self.session.SendKey(key)
+        self.session.WaitReady(0, 0)
@@ -0,0 +1,141 @@
+"""Pure-Python in-memory 24x80 host screen, for running and benchmarking bzio scripts without BlueZone."""
+
+import collections
+import re
+import time
+
+from .backends import Backend
+from .screen import COLS, ROWS, SCREEN_SIZE, Screen, screen_offset
+
+# Mnemonics that send an attention identifier to the host, which is when on_key rules run.
+AID_KEYS = frozenset(["<enter>", "<clear>", "<pa1>", "<pa2>", "<pa3>"] + ["<pf%d>" % n for n in range(1, 25)])
+
+_KEY_TOKENS = re.compile(r"<[^<>]+>|.", re.DOTALL)
+
+
+def screen_text(rows):
+    """Build a 1920 character screen from a string or a list of up to 24 row strings."""
+    if isinstance(rows, Screen):
+        return rows.text
+    if isinstance(rows, str):
+        return rows.ljust(SCREEN_SIZE)[:SCREEN_SIZE]
+    if len(rows) > ROWS:
+        raise ValueError("A screen has only %d rows." % ROWS)
+    return "".join(row.ljust(COLS)[:COLS] for row in rows).ljust(SCREEN_SIZE)
+
+
+class Emulator(Backend):
+    """Scriptable in-memory screen that behaves like a connected BlueZone session.
+
+    Screens are loaded with load() and changed in response to AID keys by rules added with on_key().
+    latency is the simulated host delay per call in seconds, or a callable returning one.
+    """
+
+    def __init__(self, screen="", cursor=(1, 1), latency=0.0):
+        self.latency = latency
+        self.calls = collections.Counter()
+        self.connected_to = None
+        self.messages = []
+        self._rules = []
+        self.load(screen, cursor)
+
+    def load(self, screen, cursor=(1, 1)):
+        """Replace the whole screen and move the cursor."""
+        self._buffer = list(screen_text(screen))
+        self._cursor = (cursor[0], cursor[1])
+
+    def on_key(self, key, action, when=None):
+        """Run action when key is sent; the first matching rule wins.
+
+        action is new screen content (see screen_text) or a callable taking (emulator, key).
+        when is text that must be on the screen, or a callable taking the emulator, or None to always match.
+        """
+        self._rules.append((key.lower(), action, when))
+
+    def snapshot(self):
+        """Return the current screen without counting a host call."""
+        return Screen("".join(self._buffer), self._cursor)
+
+    def _host_call(self, name):
+        self.calls[name] += 1
+        delay = self.latency() if callable(self.latency) else self.latency
+        if delay:
+            time.sleep(delay)
+
+    def _press(self, key):
+        for rule_key, action, when in self._rules:
+            if rule_key != key:
+                continue
+            if when is not None and not (when(self) if callable(when) else when in "".join(self._buffer)):
+                continue
+            if callable(action):
+                action(self, key)
+            else:
+                self.load(action)
+            return
+
+    def _type(self, text, row, col):
+        start = (row - 1) * COLS + col - 1
+        text = text[:SCREEN_SIZE - start]
+        self._buffer[start:start + len(text)] = text
+        end = min(start + len(text), SCREEN_SIZE - 1)
+        return end // COLS + 1, end % COLS + 1
+
+    def connect(self, screen_to_connect):
+        self._host_call("connect")
+        self.connected_to = screen_to_connect
+
+    def focus(self):
+        self._host_call("focus")
+
+    def msg_box(self, message):
+        self._host_call("msg_box")
+        self.messages.append(message)
+
+    def read_screen(self, length, row, col):
+        self._host_call("read_screen")
+        start = screen_offset(length, row, col)
+        return "".join(self._buffer[start:start + length])
+
+    def write_screen(self, text, row, col):
+        self._host_call("write_screen")
+        screen_offset(len(text), row, col)
+        self._type(text, row, col)
+
+    def send_key(self, keys):
+        self._host_call("send_key")
+        for token in _KEY_TOKENS.findall(keys):
+            if len(token) == 1:
+                self._cursor = self._type(token, *self._cursor)
+                continue
+            key = token.lower()
+            row, col = self._cursor
+            if key in AID_KEYS:
+                self._press(key)
+            elif key == "<home>":
+                self._cursor = (1, 1)
+            elif key == "<newline>":
+                self._cursor = (row % ROWS + 1, 1)
+            elif key == "<eraseeof>":
+                self._type(" " * (COLS - col + 1), row, col)
+            else:
+                self._press(key)
+
+    def wait_ready(self, timeout, extra_wait):
+        self._host_call("wait_ready")
+
+    def search(self, text):
+        self._host_call("search")
+        found = "".join(self._buffer).find(text)
+        if found < 0:
+            return 1, 0, 0
+        return 0, found // COLS + 1, found % COLS + 1
+
+    def get_cursor(self):
+        self._host_call("get_cursor")
+        return self._cursor
+
+    def set_cursor(self, row, col):
+        self._host_call("set_cursor")
+        screen_offset(0, row, col)
+        self._cursor = (row, col)
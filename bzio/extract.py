@@ -0,0 +1,141 @@
+"""Pull the same fields out of many stored screens at once, into columns.
+
+Example::
+
+    layout = {"case_number": (20, 38, 8), "status": (6, 21, 7), "worker": (21, 21, 7)}
+    with ScreenArchive("march.bza") as archive:
+        table = extract(archive, layout)
+    table.write_csv("march.csv")
+
+With NumPy installed the screens are one (screens x 1920) byte array, memory-mapped straight from an archive,
+and each field is a single slice of it. Without NumPy the same is done a screen at a time.
+"""
+
+import csv
+import glob
+import os
+
+from .archive import RECORD_SIZE, ScreenArchive
+from .screen import COLS, SCREEN_SIZE, Screen, screen_offset
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+ENCODING = "latin-1"
+
+
+def compile_layout(layout):
+    """Turn {name: (row, col, length)} into [(name, offset, length)], checking each field fits on the screen."""
+    return [(name, screen_offset(field[2], field[0], field[1]), field[2]) for name, field in layout.items()]
+
+
+def load_dumps(directory, pattern="*"):
+    """Read a directory of screen dumps and return (file names, screens) in file name order.
+
+    A dump is either the 1920 screen bytes or the screen as text, one line per row.
+    """
+    names, screens = [], []
+    for path in sorted(glob.glob(os.path.join(directory, pattern))):
+        if not os.path.isfile(path):
+            continue
+        with open(path, "rb") as f:
+            data = f.read()
+        if len(data) != SCREEN_SIZE:
+            data = b"".join(row.ljust(COLS)[:COLS] for row in data.splitlines()).ljust(SCREEN_SIZE)[:SCREEN_SIZE]
+        names.append(os.path.basename(path))
+        screens.append(data)
+    return names, screens
+
+
+def screen_array(screens):
+    """Return screens as a (count x 1920) uint8 array, or a list of bytes without NumPy.
+
+    screens may be a ScreenArchive, a NumPy array of screen bytes, or a sequence of Screens, str or bytes.
+    """
+    if isinstance(screens, ScreenArchive):
+        if numpy is None:
+            return [bytes(screens.raw(number)) for number in range(len(screens))]
+        if not len(screens):
+            return numpy.zeros((0, SCREEN_SIZE), numpy.uint8)
+        records = numpy.memmap(screens.path, numpy.uint8, "r", shape=(len(screens), RECORD_SIZE))
+        return records[:, :SCREEN_SIZE]
+    if numpy is not None and isinstance(screens, numpy.ndarray):
+        if screens.dtype.kind == "S":
+            screens = screens.view(numpy.uint8)
+        return screens.reshape(-1, SCREEN_SIZE)
+    rows = [_screen_bytes(screen) for screen in screens]
+    if numpy is None:
+        return rows
+    return numpy.frombuffer(b"".join(rows), numpy.uint8).reshape(-1, SCREEN_SIZE)
+
+
+def _screen_bytes(screen):
+    if isinstance(screen, Screen):
+        screen = screen.text
+    if isinstance(screen, str):
+        screen = screen.encode(ENCODING, "replace")
+    return bytes(screen).ljust(SCREEN_SIZE)[:SCREEN_SIZE]
+
+
+class Table(object):
+    """Columns of extracted fields, all the same length.
+
+    columns maps each field name to a NumPy string array (or a list of str without NumPy), ready to hand to
+    pandas.DataFrame or pyarrow.table for Parquet.
+    """
+
+    def __init__(self, columns):
+        self.columns = columns
+
+    def __len__(self):
+        for column in self.columns.values():
+            return len(column)
+        return 0
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def rows(self):
+        """Yield one tuple of field values per screen, in column order."""
+        return zip(*self.columns.values())
+
+    def write_csv(self, path):
+        """Write the table to a CSV file with a header row."""
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(list(self.columns))
+            writer.writerows(self.rows())
+
+
+def extract(screens, layout, select=None, strip=True):
+    """Read every field in layout from every screen and return a Table.
+
+    layout maps field names to (row, col, length), e.g. panels.Region values. select is an optional list of
+    screen indexes (such as ScreenArchive.find() results) to limit the extraction to.
+    """
+    fields = compile_layout(layout)
+    screens = screen_array(screens)
+    if select is not None:
+        screens = screens[numpy.asarray(select, numpy.intp)] if numpy is not None else [screens[n] for n in select]
+    if numpy is None:
+        return Table(dict((name, _column(screens, start, length, strip)) for name, start, length in fields))
+    columns = {}
+    for name, start, length in fields:
+        values = numpy.ascontiguousarray(screens[:, start:start + length]).view("S%d" % length).ravel()
+        if strip:
+            values = numpy.char.strip(values)
+        try:
+            columns[name] = values.astype("U%d" % length)
+        except UnicodeDecodeError:
+            # astype only decodes ASCII; the slower decode handles the rest of latin-1.
+            columns[name] = numpy.char.decode(values, ENCODING)
+    return Table(columns)
+
+
+def _column(screens, start, length, strip):
+    end = start + length
+    if strip:
+        return [screen[start:end].decode(ENCODING).strip() for screen in screens]
+    return [screen[start:end].decode(ENCODING).ljust(length) for screen in screens]
@@ -0,0 +1,274 @@
+"""Drive many sessions at once against a stand-in host, and report throughput and latency at each concurrency.
+
+Usage::
+
+    python -m bzio.loadtest [--sessions 1,4,16,64] [--duration 10] [--latency lognormal:0.02,0.5]
+                            [--scenario module:function] [--host HOST:PORT] [--output results.json] [--compare old.json]
+
+Each session is a thread with its own tn3270.TN3270Backend connection. Without --host, a tn3270host.StandInHost
+is started in this process; run ``python -m bzio.tn3270host`` separately and pass --host to keep the host off
+this process's GIL. A scenario is a function called as scenario(session, iteration) over and over until the time
+is up; the default enters a client contact note the way samples/client-contact-combined.py does.
+
+Transaction latency is the time from each AID key until the host unlocks the keyboard again. The saturation
+point is the fewest sessions that reach 90% of the best throughput seen.
+"""
+
+import argparse
+import importlib
+import json
+import math
+import platform
+import random
+import sys
+import threading
+import time
+
+from .casenote import CaseNote, NoteWriter
+from .session import Session
+from .timing import LatencySamples
+from .tn3270 import TN3270Backend
+from .tn3270host import StandInHost
+
+DEFAULT_SESSIONS = (1, 4, 16, 64)
+DEFAULT_LATENCY = "lognormal:0.02,0.5"
+# A level within this fraction of the best throughput counts as saturated.
+SATURATION = 0.9
+
+
+def parse_latency(spec):
+    """Turn "0.05", "fixed:0.05", "uniform:LOW,HIGH", "exponential:MEAN" or "lognormal:MEDIAN,SIGMA" into a delay.
+
+    Returns seconds, or a callable returning seconds for each reply.
+    """
+    kind, _, args = spec.partition(":")
+    if not args:
+        kind, args = "fixed", kind
+    values = [float(value) for value in args.split(",")]
+    if kind == "fixed" and len(values) == 1:
+        return values[0]
+    if kind == "uniform" and len(values) == 2:
+        return lambda: random.uniform(*values)
+    if kind == "exponential" and len(values) == 1:
+        return lambda: random.expovariate(1.0 / values[0])
+    if kind == "lognormal" and len(values) == 2:
+        return lambda: random.lognormvariate(math.log(values[0]), values[1])
+    raise ValueError("Unknown latency %r; see python -m bzio.loadtest --help." % spec)
+
+
+def client_contact_note(session, iteration):
+    """Open CASE/NOTE for a case from SELF, enter a two-page client contact note, and go back to SELF."""
+    with session.write_batch(key=None, verify=False) as batch:
+        batch.write("CASE", 16, 23)
+        batch.write(str(10000000 + iteration), 18, 23)
+    # The note is laid out while the host opens CASE/NOTE.
+    pending = session.send_ahead("<enter>")
+    note = CaseNote("Phone call from client re: renewal")
+    note.item("Contact was made: %s" % time.strftime("%m-%d-%Y %H:%M"))
+    note.bullet("Phone Number", "651-555-%04d" % (iteration % 10000))
+    note.bullet("Reason for contact", "Client asked about the status of the renewal paperwork sent last month "
+                                      "and whether anything else is needed before the deadline.")
+    note.bullet("Actions taken", "Reviewed case, confirmed the renewal was received and is pending "
+                                 "verification of income. Explained the verification request to the client.")
+    note.bullet("Verifs needed", "Last 30 days of pay stubs, current lease, childcare provider statement.")
+    note.bullet("Case status", "Pending verifications.")
+    for text in ["Reminded client about the importance of submitting the CAF 1.", "Follow-up is needed."] * 4:
+        note.item(text)
+    note.line("---")
+    note.line("Load Test Worker")
+    pending.result()
+    NoteWriter(session).write(note)
+    # The next iteration's first call waits for SELF.
+    session.send_ahead("<pf3>")
+
+
+class _TimedBackend(TN3270Backend):
+    """TN3270Backend that records the time from each AID key until the host unlocks the keyboard."""
+
+    def __init__(self, host, port, latency):
+        super(_TimedBackend, self).__init__(host, port)
+        self.latency = latency
+        self._sent = None
+
+    def _send_aid(self, key):
+        self._sent = time.perf_counter()
+        super(_TimedBackend, self)._send_aid(key)
+
+    def _host_record(self, data):
+        super(_TimedBackend, self)._host_record(data)
+        if self._sent is not None and not self._locked:
+            self.latency.record(time.perf_counter() - self._sent)
+            self._sent = None
+
+
+def run_level(address, sessions, scenario, duration):
+    """Run scenario on sessions threads for duration seconds; return the level's results as a dict."""
+    latencies = [LatencySamples() for _ in range(sessions)]
+    iterations = [0] * sessions
+    errors = []
+    # Sessions that stopped before the time was up, because they could not connect or reconnect.
+    dropped = []
+    deadline = []
+    # The clock starts once every session has connected, before any of them is let go.
+    ready = threading.Barrier(sessions + 1, action=lambda: deadline.append(time.perf_counter() + duration))
+
+    def drive(number):
+        backend = _TimedBackend(address[0], address[1], latencies[number])
+        session = Session(backend=backend)
+        try:
+            session.Connect("")
+        except Exception as error:
+            errors.append("%s: %s" % (type(error).__name__, error))
+            dropped.append(number)
+            ready.wait()
+            return
+        ready.wait()
+        attempt = 0
+        while time.perf_counter() < deadline[0]:
+            try:
+                scenario(session, number * 1000000 + attempt)
+                iterations[number] += 1
+            except Exception as error:
+                # Count the failure and start the next iteration from a fresh connection.
+                errors.append("%s: %s" % (type(error).__name__, error))
+                try:
+                    session.Connect("")
+                except Exception as error:
+                    errors.append("%s: %s" % (type(error).__name__, error))
+                    dropped.append(number)
+                    break
+            attempt += 1
+        backend.close()
+
+    threads = [threading.Thread(target=drive, args=(number,)) for number in range(sessions)]
+    for thread in threads:
+        thread.start()
+    ready.wait()
+    started = deadline[0] - duration
+    for thread in threads:
+        thread.join()
+    # Rates are over the whole window, even if every session dropped out early.
+    elapsed = max(time.perf_counter() - started, duration)
+
+    latency = LatencySamples()
+    for samples in latencies:
+        latency.merge(samples)
+    return {
+        "sessions": sessions,
+        "seconds": round(elapsed, 3),
+        "iterations": sum(iterations),
+        "transactions": latency.count,
+        "throughput": round(sum(iterations) / elapsed, 3),
+        "transactions_per_second": round(latency.count / elapsed, 3),
+        "p50_ms": round(latency.percentile(50) * 1000, 3),
+        "p95_ms": round(latency.percentile(95) * 1000, 3),
+        "p99_ms": round(latency.percentile(99) * 1000, 3),
+        "max_ms": round(latency.max * 1000, 3),
+        "errors": len(errors),
+        "first_error": errors[0] if errors else None,
+        "dropped_sessions": len(dropped),
+    }
+
+
+def saturation(levels):
+    """The fewest sessions reaching SATURATION of the best throughput, or None if nothing ran."""
+    if not levels:
+        return None
+    best = max(level["throughput"] for level in levels)
+    return min(level["sessions"] for level in levels if level["throughput"] >= best * SATURATION)
+
+
+def run(sessions=DEFAULT_SESSIONS, scenario=client_contact_note, duration=10.0, latency=DEFAULT_LATENCY, address=None,
+        progress=print):
+    """Run every concurrency level and return the results as a JSON-ready dict."""
+    host = None
+    if address is None:
+        host = StandInHost(latency=parse_latency(latency)).start()
+        address = host.address
+    try:
+        levels = []
+        for count in sessions:
+            levels.append(run_level(address, count, scenario, duration))
+            if progress is not None:
+                progress(format_level(levels[-1]))
+    finally:
+        if host is not None:
+            host.stop()
+    return {
+        "scenario": "%s.%s" % (scenario.__module__, scenario.__name__),
+        "latency": latency if host is not None else "external host %s:%d" % tuple(address),
+        "duration": duration,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "started": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "levels": levels,
+        "saturation": saturation(levels),
+    }
+
+
+def format_level(level):
+    text = ("%4d sessions  %8.1f iterations/s  %8.1f transactions/s  p50 %7.1f ms  p95 %7.1f ms  p99 %7.1f ms  %d errors"
+            % (level["sessions"], level["throughput"], level["transactions_per_second"], level["p50_ms"],
+               level["p95_ms"], level["p99_ms"], level["errors"]))
+    if level.get("dropped_sessions"):
+        text += "  %d sessions dropped out" % level["dropped_sessions"]
+    return text
+
+
+def compare(old, new):
+    """Return lines comparing two results dicts level by level: throughput and p95 changes in percent."""
+    before = dict((level["sessions"], level) for level in old["levels"])
+    lines = []
+    for level in new["levels"]:
+        previous = before.get(level["sessions"])
+        if previous is None:
+            continue
+        lines.append("%4d sessions  throughput %+6.1f%%  p95 %+6.1f%%  p99 %+6.1f%%" % (
+            level["sessions"], _change(previous["throughput"], level["throughput"]),
+            _change(previous["p95_ms"], level["p95_ms"]), _change(previous["p99_ms"], level["p99_ms"])))
+    lines.append("saturation: %s -> %s sessions" % (old.get("saturation"), new.get("saturation")))
+    return lines
+
+
+def _change(old, new):
+    return (new - old) * 100.0 / old if old else 0.0
+
+
+def _load_scenario(name):
+    module, _, function = name.partition(":")
+    return getattr(importlib.import_module(module), function)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m bzio.loadtest", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sessions", default=",".join(str(n) for n in DEFAULT_SESSIONS),
+                        help="comma-separated concurrency levels (default %(default)s)")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per level (default %(default)s)")
+    parser.add_argument("--latency", default=DEFAULT_LATENCY,
+                        help="stand-in host reply delay: SECONDS, fixed:S, uniform:LOW,HIGH, exponential:MEAN or "
+                             "lognormal:MEDIAN,SIGMA (default %(default)s)")
+    parser.add_argument("--scenario", help="module:function to run instead of the client contact note")
+    parser.add_argument("--host", help="HOST:PORT of a running stand-in host instead of starting one here")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="compare with the results in this JSON file")
+    options = parser.parse_args(argv)
+
+    parse_latency(options.latency)
+    scenario = _load_scenario(options.scenario) if options.scenario else client_contact_note
+    address = None
+    if options.host:
+        host, port = options.host.rsplit(":", 1)
+        address = (host, int(port))
+    results = run([int(n) for n in options.sessions.split(",")], scenario, options.duration, options.latency, address)
+    print("saturation: %s sessions" % results["saturation"])
+    if options.output:
+        with open(options.output, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    if options.compare:
+        with open(options.compare) as f:
+            print("\n".join(compare(json.load(f), results)))
+    return 0 if not any(level["errors"] for level in results["levels"]) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
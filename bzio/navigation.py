@@ -0,0 +1,133 @@
+"""Move between host panels along the fewest transmits, skipping navigation when already on the right panel.
+
+Example::
+
+    nav = Navigator(classifier, case_number_at=Region(20, 38, 8))
+    nav.add_route("SELF", "STAT/MEMB", writes=[("STAT", 16, 43), ("{case_number}", 18, 43), ("MEMB", 21, 70)])
+    nav.add_route("STAT/MEMB", "STAT/JOBS", writes=[("JOBS", 20, 71)])
+    nav.add_route("STAT/MEMB", "SELF", key="<pf3>")
+    nav.go("STAT/JOBS", case_number="123456")
+"""
+
+import collections
+
+import bzio
+
+from .panels import Region
+from .screen import Screen, screen_offset
+
+Route = collections.namedtuple("Route", "source target writes key")
+
+
+class NavigationError(RuntimeError):
+    """The session could not be moved to the requested panel."""
+
+
+class Navigator(object):
+    """Graph of panels joined by routes (field writes followed by one AID key), driving the bzio functions.
+
+    classifier is a panels.PanelClassifier that knows every panel in the graph. case_number_at is the Region
+    holding the case number on case panels, so a panel reached for another case is not mistaken for the target.
+    session is the session.Session to drive; by default the module-level bzio functions.
+    """
+
+    def __init__(self, classifier, case_number_at=None, session=None):
+        self.classifier = classifier
+        self.session = session if session is not None else bzio
+        self.case_number_at = Region(*case_number_at) if case_number_at else None
+        self.routes = collections.defaultdict(list)
+        self.current = None
+        self.transmits = 0
+
+    def add_route(self, source, target, writes=(), key="<enter>"):
+        """Add a one-transmit hop; writes are (text, row, col) and text may use {case_number} style fields."""
+        route = Route(source, target, tuple(writes), key)
+        self.routes[source].append(route)
+        return route
+
+    def where(self, screen=None):
+        """Identify the current panel from a Screen or screen text (read now if not given) and remember it."""
+        if screen is None:
+            screen = self.session.read_text()
+        self.current = self.classifier.classify(screen).panel
+        return self.current
+
+    def plan(self, source, target, set_case=False):
+        """Return the shortest list of Routes from source to target (empty if they are the same panel).
+
+        With set_case, the path must include a route that writes {case_number}, because the session is on the
+        wrong case (or on no case) at the moment.
+        """
+        start = (source, not set_case)
+        previous = {start: None}
+        queue = collections.deque([start])
+        while queue:
+            state = queue.popleft()
+            panel, has_case = state
+            if panel == target and has_case:
+                path = []
+                while previous[state] is not None:
+                    state, route = previous[state]
+                    path.append(route)
+                return path[::-1]
+            for route in self.routes.get(panel, ()):
+                nxt = (route.target, has_case or any("{case_number}" in text for text, row, col in route.writes))
+                if nxt not in previous:
+                    previous[nxt] = (state, route)
+                    queue.append(nxt)
+        raise NavigationError("There is no route from %s to %s." % (source, target))
+
+    def go(self, target, case_number=None, **fields):
+        """Navigate to target, doing nothing if the session is already there for the same case.
+
+        Returns the number of transmits used.
+        """
+        # Only the text is needed, so each check is one read_screen call and not a whole Snapshot.
+        screen = self.session.read_text()
+        same_case = self._same_case(screen, case_number)
+        if self.where(screen) == target and same_case:
+            return 0
+        if self.current is None:
+            raise NavigationError("The current screen is not a known panel.")
+        fields["case_number"] = "" if case_number is None else case_number
+        path = self.plan(self.current, target, set_case=not same_case)
+        for route in path:
+            screen = self._follow(route, fields, screen)
+        if not self._same_case(screen, case_number):
+            raise NavigationError("Reached %s, but for case %s instead of %s." % (target, self._case_on(screen), case_number))
+        return len(path)
+
+    def _case_on(self, screen):
+        region = self.case_number_at
+        return _read(screen, region.length, region.row, region.col).strip(" _")
+
+    def _same_case(self, screen, case_number):
+        if case_number is None or self.case_number_at is None:
+            return True
+        return self._case_on(screen) == str(case_number).strip()
+
+    def _follow(self, route, fields, screen):
+        """Take one route from screen and return the screen text of the panel it reached."""
+        for text, row, col in route.writes:
+            value = text.format(**fields)
+            if "{case_number}" in text and self.case_number_at is not None:
+                # Fill the whole field, so the digits of a longer case number already in it do not stay behind.
+                field = _read(screen, self.case_number_at.length, row, col)
+                value = value.ljust(self.case_number_at.length, "_" if field.endswith("_") else " ")
+            self.session.WriteScreen(value, row, col)
+        self.session.SendKey(route.key)
+        self.session.WaitReady(0, 0)
+        self.transmits += 1
+        screen = self.session.read_text()
+        arrived = self.classifier.classify(screen)
+        self.current = arrived.panel
+        if arrived.panel != route.target:
+            raise NavigationError("Expected %s but reached %s%s." % (route.target, arrived.panel, ": %s" % arrived.error if arrived.error else ""))
+        return screen
+
+
+def _read(screen, length, row, col):
+    """Read from a Screen or screen text without counting it as one of the script's snapshot reads."""
+    text = screen.text if isinstance(screen, Screen) else screen
+    start = screen_offset(length, row, col)
+    return text[start:start + length]
@@ -0,0 +1,83 @@
+"""Identify which host panel a screen shows from one snapshot, by fingerprinting its fixed header text."""
+
+import collections
+import hashlib
+import json
+
+from .screen import Screen, screen_offset
+
+Region = collections.namedtuple("Region", "row col length")
+
+Classification = collections.namedtuple("Classification", "panel function error fingerprint")
+
+# Header text that is the same on every copy of a panel. The defaults cover the MAXIS panel title area;
+# PRISM or other layouts can pass their own regions.
+MAXIS_HEADER = (Region(2, 1, 80), Region(3, 1, 40))
+MAXIS_ERROR_LINE = Region(24, 2, 78)
+
+
+class PanelClassifier(object):
+    """Registry of known panels keyed by a fingerprint of their header regions.
+
+    classify() costs one hash of the header text plus one dictionary lookup, however many panels are registered.
+    """
+
+    def __init__(self, header=MAXIS_HEADER, error_line=MAXIS_ERROR_LINE):
+        self.header = tuple(Region(*region) for region in header)
+        self.error_line = Region(*error_line) if error_line else None
+        self._slices = [(screen_offset(r.length, r.row, r.col), r.length) for r in self.header]
+        self._panels = {}
+
+    def __len__(self):
+        return len(self._panels)
+
+    def __contains__(self, panel):
+        return any(known[0] == panel for known in self._panels.values())
+
+    def fingerprint(self, screen):
+        """Return a short stable hex digest of the screen's header regions."""
+        text = screen.text if isinstance(screen, Screen) else screen
+        header = "|".join(text[start:start + length] for start, length in self._slices)
+        return hashlib.blake2b(header.encode("utf-8"), digest_size=8).hexdigest()
+
+    def register(self, panel, sample, function=None):
+        """Learn a panel from a captured sample screen and return its fingerprint.
+
+        Raises ValueError if the sample's header already belongs to a different panel.
+        """
+        fingerprint = self.fingerprint(sample)
+        known = self._panels.get(fingerprint)
+        if known is not None and known != (panel, function):
+            raise ValueError("That header is already registered as %s." % known[0])
+        self._panels[fingerprint] = (panel, function)
+        return fingerprint
+
+    def classify(self, screen):
+        """Return the Classification of a screen; panel and function are None if it is not registered."""
+        text = screen.text if isinstance(screen, Screen) else screen
+        fingerprint = self.fingerprint(text)
+        panel, function = self._panels.get(fingerprint, (None, None))
+        error = None
+        if self.error_line is not None:
+            start = screen_offset(self.error_line.length, self.error_line.row, self.error_line.col)
+            error = text[start:start + self.error_line.length].strip() or None
+        return Classification(panel, function, error, fingerprint)
+
+    def save(self, path):
+        """Write the regions and registered fingerprints to a JSON file."""
+        data = {
+            "header": [list(region) for region in self.header],
+            "error_line": list(self.error_line) if self.error_line else None,
+            "panels": dict((fingerprint, list(known)) for fingerprint, known in self._panels.items()),
+        }
+        with open(path, "w") as f:
+            json.dump(data, f, indent=1, sort_keys=True)
+
+    @classmethod
+    def load(cls, path):
+        """Read a classifier written by save()."""
+        with open(path) as f:
+            data = json.load(f)
+        classifier = cls(data["header"], data["error_line"])
+        classifier._panels = dict((fingerprint, tuple(known)) for fingerprint, known in data["panels"].items())
+        return classifier
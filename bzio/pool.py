@@ -0,0 +1,142 @@
+"""Spread a case list over several host sessions, each driven by its own worker process.
+
+Example::
+
+    def update_case(session, case_number):
+        session.WriteScreen(case_number, 18, 43)
+        session.Transmit()
+        return session.ReadScreen(8, 4, 30)
+
+    if __name__ == "__main__":
+        pool = SessionPool(["A", "B", "C", "D"], update_case, checkpoint_path="update_case.checkpoint")
+        for result in pool.run(read_cases("cases.csv")):
+            print(result)
+
+action and backend_factory must be module-level functions so the worker processes can import them.
+"""
+
+import collections
+import multiprocessing
+import queue
+import time
+
+from .runner import Checkpoint
+from .session import Session
+
+CaseResult = collections.namedtuple("CaseResult", "case_number screen value error")
+
+# How often run() checks whether a worker process has died while waiting for results, in seconds.
+WORKER_CHECK_INTERVAL = 0.5
+
+
+def _worker(index, screen, action, backend_factory, inbox, results):
+    """Drive one screen in a worker process: run action for each case put in inbox, until None arrives."""
+    backend = backend_factory(screen) if backend_factory is not None else None
+    session = Session(screen, backend=backend)
+    while True:
+        case_number = inbox.get()
+        if case_number is None:
+            return
+        try:
+            value = action(session, case_number)
+        except Exception as e:
+            result = CaseResult(case_number, screen, None, "%s: %s" % (type(e).__name__, e))
+        else:
+            result = CaseResult(case_number, screen, value, None)
+        results.put((index, result))
+
+
+class SessionPool(object):
+    """Runs action(session, case_number) for every case, one worker process per host screen.
+
+    Cases go to whichever session is free next. backend_factory(screen) may build each worker's backend (e.g. an
+    emulator.Emulator); by default each worker gets its own BlueZone automation object connected to its screen.
+    With checkpoint_path, finished cases are recorded as in runner.CaseRunner and skipped on the next run.
+    """
+
+    def __init__(self, screens, action, backend_factory=None, checkpoint_path=None):
+        self.screens = list(screens)
+        self.action = action
+        self.backend_factory = backend_factory
+        self.checkpoint_path = checkpoint_path
+        self.done = 0
+        self.failed = 0
+        self.elapsed = 0.0
+
+    @property
+    def cases_per_minute(self):
+        """Throughput across all sessions so far."""
+        return (self.done + self.failed) * 60.0 / self.elapsed if self.elapsed else 0.0
+
+    def run(self, cases):
+        """Yield a CaseResult for each case as the sessions finish them (not in input order).
+
+        Each screen has one worker process for the whole run, and a case is only handed to a worker once it is
+        free. If a worker dies, the case it was running is yielded with an error and the other sessions carry on;
+        RuntimeError is raised if every worker dies before the cases run out.
+        """
+        checkpoint = Checkpoint(self.checkpoint_path) if self.checkpoint_path else None
+        if checkpoint is not None:
+            cases = (case_number for case_number in cases if case_number not in checkpoint)
+        cases = iter(cases)
+        results = multiprocessing.Queue()
+        inboxes = []
+        workers = []
+        for index, screen in enumerate(self.screens):
+            inbox = multiprocessing.Queue()
+            worker = multiprocessing.Process(target=_worker, args=(index, screen, self.action, self.backend_factory, inbox, results),
+                                             name="bzio session %s" % screen)
+            worker.daemon = True
+            worker.start()
+            inboxes.append(inbox)
+            workers.append(worker)
+        # The case each busy worker is running, by worker index.
+        busy = {}
+        started = time.perf_counter()
+        try:
+            for index in range(len(workers)):
+                case_number = next(cases, None)
+                if case_number is None:
+                    break
+                inboxes[index].put(case_number)
+                busy[index] = case_number
+            while busy:
+                try:
+                    index, result = results.get(timeout=WORKER_CHECK_INTERVAL)
+                except queue.Empty:
+                    for index, case_number in list(busy.items()):
+                        if workers[index].exitcode is not None:
+                            del busy[index]
+                            error = "The worker process for screen %r stopped with exit code %s." % (self.screens[index], workers[index].exitcode)
+                            yield self._finished(CaseResult(case_number, self.screens[index], None, error), checkpoint, started)
+                    continue
+                del busy[index]
+                yield self._finished(result, checkpoint, started)
+                case_number = next(cases, None)
+                if case_number is not None:
+                    inboxes[index].put(case_number)
+                    busy[index] = case_number
+            # Workers only go idle once the cases have run out, so cases left over mean every worker has died.
+            if next(cases, None) is not None:
+                raise RuntimeError("Every worker process stopped before all the cases were run.")
+        finally:
+            for index, worker in enumerate(workers):
+                if index in busy:
+                    worker.terminate()
+                elif worker.exitcode is None:
+                    inboxes[index].put(None)
+            for worker in workers:
+                worker.join()
+            if checkpoint is not None:
+                checkpoint.close()
+
+    def _finished(self, result, checkpoint, started):
+        """Count and checkpoint one finished case, and return it."""
+        if result.error is None:
+            self.done += 1
+        else:
+            self.failed += 1
+        if checkpoint is not None:
+            checkpoint.record(result.case_number, "ok" if result.error is None else "error: %s" % result.error)
+        self.elapsed = time.perf_counter() - started
+        return result
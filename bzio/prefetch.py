@@ -0,0 +1,55 @@
+"""Read from the host on a background thread while the script waits on something else, such as a dialog.
+
+Example::
+
+    def read_case(session, case_number):
+        session.WriteScreen(case_number, 18, 43)
+        session.Transmit()
+        return session.ReadScreen(8, 8, 9)
+
+    prefetch = Prefetch(read_case, case_number)
+    dialog.ShowModal()               # the host reads happen while the worker types
+    status = prefetch.result()
+
+The background thread gets its own session.Session, with its own BlueZone automation object attached to the same
+screen, so nothing is shared across threads. The script should leave the screen alone until result() returns.
+"""
+
+import concurrent.futures
+
+from .backends import enter_apartment, leave_apartment
+from .session import Session
+
+
+class Prefetch(object):
+    """Runs function(session, *args) on a thread of its own, starting at once.
+
+    screen_to_connect is the screen the background session attaches to ("" for the script's own); backend
+    replaces BlueZone, e.g. with an emulator.Emulator.
+    """
+
+    def __init__(self, function, *args, screen_to_connect="", backend=None):
+        self.session = Session(backend=backend)
+        self._screen_to_connect = screen_to_connect
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        executor.submit(enter_apartment)
+        self._future = executor.submit(self._run, function, args)
+        executor.submit(leave_apartment)
+        executor.shutdown(wait=False)
+
+    def _run(self, function, args):
+        if self._screen_to_connect is not None:
+            self.session.Connect(self._screen_to_connect)
+        return function(self.session, *args)
+
+    def done(self):
+        """Whether the background work has finished."""
+        return self._future.done()
+
+    def result(self, timeout=None):
+        """Wait for the background work and return its result, or raise its exception."""
+        return self._future.result(timeout)
+
+    def add_done_callback(self, callback):
+        """Call callback(prefetch) once the work finishes, on the background thread (or at once if it has)."""
+        self._future.add_done_callback(lambda future: callback(self))
@@ -0,0 +1,169 @@
+"""Count the host round trips a script makes, per source line.
+
+Usage::
+
+    python -m bzio.profile [--top N] myscript.py [script arguments...]
+
+Runs the script as it would normally run, then prints which lines made the most host calls and how long they
+took, followed by hotspots: the same coordinates read again with nothing sent to the host in between, and the
+cursor fetched twice in a row (e.g. CursorRow() then CursorCol(), where one GetCursor() would do).
+"""
+
+import argparse
+import collections
+import linecache
+import os
+import runpy
+import sys
+import time
+
+from . import backends
+from .trace import caller
+
+# Backend calls that may change the screen; reads repeated after one of these are not counted as wasted.
+CHANGES_SCREEN = frozenset(["connect", "send_key", "write_screen", "set_cursor"])
+HOST_CALLS = frozenset(name for name in vars(backends.Backend) if not name.startswith("_"))
+
+LineStats = collections.namedtuple("LineStats", "calls seconds repeated")
+
+
+class Profiler(object):
+    """Per-line host call counts, collected by wrapping each backend a Connection hands out."""
+
+    def __init__(self):
+        self.calls = collections.Counter()
+        self.seconds = collections.Counter()
+        self.repeated = collections.Counter()
+        self.cursor_twice = collections.Counter()
+        self._proxies = {}
+        self._original_host = None
+
+    def start(self):
+        profiler = self
+        original = self._original_host = backends.Connection.host
+
+        def host(connection):
+            backend = original(connection)
+            proxy = profiler._proxies.get(id(backend))
+            if proxy is None:
+                proxy = profiler._proxies[id(backend)] = _RecordingBackend(backend, profiler)
+            return proxy
+
+        backends.Connection.host = host
+
+    def stop(self):
+        if self._original_host is not None:
+            backends.Connection.host = self._original_host
+            self._original_host = None
+
+    def record(self, line, name, seconds, repeated, cursor_twice):
+        self.calls[line] += 1
+        self.seconds[line] += seconds
+        if repeated:
+            self.repeated[line] += 1
+        if cursor_twice:
+            self.cursor_twice[line] += 1
+
+    def lines(self):
+        """Return [(line, LineStats)] with the most host time first."""
+        return [(line, LineStats(self.calls[line], self.seconds[line], self.repeated[line]))
+                for line in sorted(self.calls, key=lambda line: -self.seconds[line])]
+
+    def report(self, top=20):
+        """Return the per-line table and the hotspot list as text."""
+        total_calls = sum(self.calls.values())
+        total_seconds = sum(self.seconds.values())
+        out = ["%d host calls, %.3f s of host time" % (total_calls, total_seconds), ""]
+        out.append("%-32s %7s %10s %8s  %s" % ("line", "calls", "host ms", "repeats", "source"))
+        for line, stats in self.lines()[:top]:
+            out.append("%-32s %7d %10.1f %8d  %s" % (_where(line), stats.calls, stats.seconds * 1000, stats.repeated, _source(line)))
+        hotspots = []
+        for line, count in self.repeated.most_common():
+            hotspots.append("%s: %d reads of coordinates already read since the last host change; read once or use Snapshot()"
+                            % (_where(line), count))
+        for line, count in self.cursor_twice.most_common():
+            hotspots.append("%s: %d cursor fetches straight after another; use GetCursor() once" % (_where(line), count))
+        if hotspots:
+            out += ["", "Hotspots:"] + ["  " + hotspot for hotspot in hotspots[:top]]
+        return "\n".join(out)
+
+
+class _RecordingBackend(object):
+    """Passes calls through to a backend, timing each and noting which script line made it."""
+
+    def __init__(self, backend, profiler):
+        self._backend = backend
+        self._profiler = profiler
+        self._reads = {}
+        self._last = None
+
+    def __getattr__(self, name):
+        attr = getattr(self._backend, name)
+        if name not in HOST_CALLS or not callable(attr):
+            return attr
+
+        def call(*args):
+            line = caller()
+            started = time.perf_counter()
+            result = None
+            failed = True
+            try:
+                result = attr(*args)
+                failed = False
+                return result
+            finally:
+                self._note(name, args, result, failed, line, time.perf_counter() - started)
+        return call
+
+    def _note(self, name, args, result, failed, line, seconds):
+        repeated = cursor_twice = False
+        if name in CHANGES_SCREEN:
+            self._reads.clear()
+        elif failed:
+            # A call that raised returned nothing to compare, so it is neither a repeat nor a read to repeat.
+            pass
+        elif name == "read_screen":
+            # Only a read that came back the same was wasted; one that saw the host change was not.
+            repeated = self._reads.get(args) == result
+            self._reads[args] = result
+        elif name == "get_cursor":
+            cursor_twice = self._last == "get_cursor"
+        self._last = name
+        self._profiler.record(line, name, seconds, repeated, cursor_twice)
+
+
+def _where(line):
+    if line is None:
+        return "(bzio)"
+    return "%s:%d" % line
+
+
+def _source(line):
+    if line is None:
+        return ""
+    return linecache.getline(line[0], line[1]).strip()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m bzio.profile", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--top", type=int, default=20, help="how many lines and hotspots to show")
+    parser.add_argument("script")
+    parser.add_argument("args", nargs=argparse.REMAINDER)
+    options = parser.parse_args(argv)
+
+    sys.argv = [options.script] + options.args
+    # As when the script is run directly, modules next to it can be imported.
+    sys.path.insert(0, os.path.dirname(os.path.abspath(options.script)))
+    profiler = Profiler()
+    profiler.start()
+    try:
+        runpy.run_path(options.script, run_name="__main__")
+    except SystemExit:
+        pass
+    finally:
+        profiler.stop()
+        print(profiler.report(options.top), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+"""Record host sessions to a compact binary log and replay them later without a host.
+
+Recording::
+
+    recorder = start_recording("case_note.bzrec")   # wraps the default session's backend
+    run_my_script()
+    recorder.close()
+
+Replaying::
+
+    bzio.use_backend(Replay("case_note.bzrec"))
+    run_my_script()   # sees the same screens, instantly, and must send the same input
+
+The log holds every input (writes, keys, cursor moves and so on) and every screen state the script saw. Screens
+are stored as per-row deltas against the previous screen, zlib-compressed when that is smaller.
+"""
+
+import json
+import struct
+import time
+import zlib
+
+from . import default_session
+from .backends import Backend
+from .screen import COLS, SCREEN_SIZE, screen_offset
+
+MAGIC = b"BZRC\x02"
+
+# Record types.
+SCREEN = 1
+SCREEN_Z = 2
+CURSOR = 3
+INPUT = 4
+
+# Record header: type, seconds since the recording started, payload length.
+_HEADER = struct.Struct("<BdI")
+# The header for each log version; version 1 logs had a 16-bit payload length and are still read.
+_HEADERS = {MAGIC: _HEADER, b"BZRC\x01": struct.Struct("<BdH")}
+_RUN = struct.Struct("<HH")
+_CURSOR = struct.Struct("<BB")
+
+ENCODING = "latin-1"
+
+
+class ReplayError(RuntimeError):
+    """The script being replayed did something other than what was recorded."""
+
+
+def screen_delta(old, new):
+    """Encode the rows of new that differ from old as (offset, length, text) runs."""
+    runs = []
+    for start in range(0, SCREEN_SIZE, COLS):
+        old_row, new_row = old[start:start + COLS], new[start:start + COLS]
+        if old_row == new_row:
+            continue
+        first = next(i for i in range(COLS) if old_row[i] != new_row[i])
+        last = next(i for i in range(COLS - 1, -1, -1) if old_row[i] != new_row[i])
+        runs.append(_RUN.pack(start + first, last - first + 1) + new_row[first:last + 1].encode(ENCODING, "replace"))
+    return b"".join(runs)
+
+
+def apply_delta(old, payload):
+    """Apply runs made by screen_delta to the screen text old."""
+    screen = list(old)
+    pos = 0
+    while pos < len(payload):
+        offset, length = _RUN.unpack_from(payload, pos)
+        pos += _RUN.size
+        screen[offset:offset + length] = payload[pos:pos + length].decode(ENCODING)
+        pos += length
+    return "".join(screen)
+
+
+class RecordingBackend(Backend):
+    """Passes calls to another backend and appends what happened to a log file.
+
+    Every read fetches the whole screen in one host call, so the log always holds the full screen a script saw;
+    screen searches are answered from that copy too.
+    """
+
+    def __init__(self, backend, path):
+        self.backend = backend
+        self.path = path
+        self._file = open(path, "wb")
+        self._file.write(MAGIC)
+        self._started = time.perf_counter()
+        self._screen = " " * SCREEN_SIZE
+        self._cursor = None
+
+    def close(self):
+        """Finish the log; the wrapped backend is left as it is."""
+        self._file.close()
+
+    def _write(self, kind, payload):
+        self._file.write(_HEADER.pack(kind, time.perf_counter() - self._started, len(payload)) + payload)
+        self._file.flush()
+
+    def _input(self, name, *args):
+        self._write(INPUT, json.dumps([name] + list(args), separators=(",", ":")).encode("utf-8"))
+
+    def _capture(self):
+        screen = self.backend.read_screen(SCREEN_SIZE, 1, 1)
+        if screen != self._screen:
+            delta = screen_delta(self._screen, screen)
+            packed = zlib.compress(delta)
+            if len(packed) < len(delta):
+                self._write(SCREEN_Z, packed)
+            else:
+                self._write(SCREEN, delta)
+            self._screen = screen
+        return screen
+
+    def connect(self, screen_to_connect):
+        self._input("connect", screen_to_connect)
+        self.backend.connect(screen_to_connect)
+
+    def focus(self):
+        self._input("focus")
+        self.backend.focus()
+
+    def msg_box(self, message):
+        self._input("msg_box", message)
+        self.backend.msg_box(message)
+
+    def read_screen(self, length, row, col):
+        start = screen_offset(length, row, col)
+        return self._capture()[start:start + length]
+
+    def write_screen(self, text, row, col):
+        self._input("write_screen", text, row, col)
+        self.backend.write_screen(text, row, col)
+
+    def send_key(self, keys):
+        self._input("send_key", keys)
+        self.backend.send_key(keys)
+
+    def wait_ready(self, timeout, extra_wait):
+        self._input("wait_ready", timeout, extra_wait)
+        self.backend.wait_ready(timeout, extra_wait)
+
+    def search(self, text):
+        return _search(self._capture(), text)
+
+    def get_cursor(self):
+        cursor = tuple(self.backend.get_cursor())
+        if cursor != self._cursor:
+            self._write(CURSOR, _CURSOR.pack(*cursor))
+            self._cursor = cursor
+        return cursor
+
+    def set_cursor(self, row, col):
+        self._input("set_cursor", row, col)
+        self.backend.set_cursor(row, col)
+
+
+def read_log(path):
+    """Yield (kind, seconds, value) from a log: screen text for screens, (row, col) for cursors, [name, args...] for inputs."""
+    with open(path, "rb") as f:
+        data = f.read()
+    header = _HEADERS.get(data[:len(MAGIC)])
+    if header is None:
+        raise ValueError("%s is not a bzio recording." % path)
+    pos = len(MAGIC)
+    screen = " " * SCREEN_SIZE
+    while pos + header.size <= len(data):
+        kind, seconds, length = header.unpack_from(data, pos)
+        pos += header.size
+        payload = data[pos:pos + length]
+        if len(payload) < length:
+            break  # Cut short by a crash while recording; everything before it is still good.
+        pos += length
+        if kind in (SCREEN, SCREEN_Z):
+            screen = apply_delta(screen, zlib.decompress(payload) if kind == SCREEN_Z else payload)
+            yield SCREEN, seconds, screen
+        elif kind == CURSOR:
+            yield CURSOR, seconds, _CURSOR.unpack(payload)
+        elif kind == INPUT:
+            yield INPUT, seconds, json.loads(payload.decode("utf-8"))
+
+
+class Replay(Backend):
+    """Backend that plays a recording back.
+
+    After each input the script sends, reads see the last screen recorded before the following input, so
+    polling loops finish at once. With strict set, input that differs from the recording raises ReplayError.
+    speed 0 replays as fast as possible; 1.0 waits as long as the host originally took to respond.
+    """
+
+    def __init__(self, path, strict=True, speed=0.0):
+        self.strict = strict
+        self.speed = speed
+        self._steps = []
+        # Each step is (input and when it was sent, the screen and cursor it led to, when the host last changed).
+        screen, cursor = " " * SCREEN_SIZE, (1, 1)
+        pending = changed = None
+        for kind, seconds, value in read_log(path):
+            if kind == INPUT:
+                self._steps.append((pending, screen, cursor, changed))
+                pending, changed = (value, seconds), None
+                continue
+            if kind == SCREEN:
+                screen = value
+            else:
+                cursor = value
+            changed = seconds
+        self._steps.append((pending, screen, cursor, changed))
+        self._next = 0
+        self._advance(None)
+
+    @property
+    def finished(self):
+        """Whether every recorded input has been replayed."""
+        return self._next >= len(self._steps)
+
+    def _advance(self, sent):
+        if self.finished:
+            raise ReplayError("The script sent %r after the recording ended." % (sent,))
+        expected, self._screen, self._cursor, changed_at = self._steps[self._next]
+        if expected is not None:
+            recorded, sent_at = expected
+            if self.strict and recorded != sent:
+                raise ReplayError("The recording sent %r here, not %r." % (recorded, sent))
+            if self.speed and changed_at is not None:
+                time.sleep((changed_at - sent_at) * self.speed)
+        self._next += 1
+
+    def connect(self, screen_to_connect):
+        self._advance(["connect", screen_to_connect])
+
+    def focus(self):
+        self._advance(["focus"])
+
+    def msg_box(self, message):
+        self._advance(["msg_box", message])
+
+    def read_screen(self, length, row, col):
+        start = screen_offset(length, row, col)
+        return self._screen[start:start + length]
+
+    def write_screen(self, text, row, col):
+        self._advance(["write_screen", text, row, col])
+
+    def send_key(self, keys):
+        self._advance(["send_key", keys])
+
+    def wait_ready(self, timeout, extra_wait):
+        self._advance(["wait_ready", timeout, extra_wait])
+
+    def search(self, text):
+        return _search(self._screen, text)
+
+    def get_cursor(self):
+        return self._cursor
+
+    def set_cursor(self, row, col):
+        self._advance(["set_cursor", row, col])
+
+
+def _search(screen, text):
+    found = screen.find(text)
+    if found < 0:
+        return 1, 0, 0
+    return 0, found // COLS + 1, found % COLS + 1
+
+
+def start_recording(path, session=None):
+    """Start recording a session (the default one unless given) and return the RecordingBackend; close() it when done."""
+    if session is None:
+        session = default_session
+    recorder = RecordingBackend(session.connection.host(), path)
+    session.use_backend(recorder)
+    return recorder
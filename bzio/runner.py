@@ -0,0 +1,150 @@
+"""Run one action over a long list of cases, with a checkpoint file so an interrupted run can pick up where it stopped.
+
+Example::
+
+    def update_case(case_number, runner):
+        with runner.stage("navigate"):
+            nav.go("STAT/MEMB", case_number=case_number)
+        with runner.stage("read"):
+            ...
+
+    runner = CaseRunner(update_case, "update_case.checkpoint")
+    runner.run(read_cases("cases.csv"))
+    print(runner.report())
+"""
+
+import contextlib
+import csv
+import itertools
+import os
+import time
+
+from .timing import LatencyHistogram
+
+
+def read_cases(path, column="case_number"):
+    """Yield case numbers from a CSV file, one row at a time.
+
+    Uses the named column if the file has a header row containing it, otherwise the first column.
+    Blank values are skipped.
+    """
+    with open(path, newline="") as f:
+        rows = csv.reader(f)
+        header = next(rows, None)
+        if header is None:
+            return
+        if column in header:
+            index = header.index(column)
+        else:
+            index = 0
+            rows = itertools.chain([header], rows)
+        for row in rows:
+            if len(row) > index and row[index].strip():
+                yield row[index].strip()
+
+
+class Checkpoint(object):
+    """Append-only record of finished cases, one "case<TAB>status" line each, written through to disk per case."""
+
+    def __init__(self, path):
+        self.path = path
+        self.status = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                for line in f:
+                    case_number, _, status = line.rstrip("\n").partition("\t")
+                    if case_number:
+                        self.status[case_number] = status
+        self._file = open(path, "a")
+
+    def __contains__(self, case_number):
+        return case_number in self.status
+
+    def record(self, case_number, status="ok"):
+        """Mark a case finished; the line is flushed and synced so a crash straight afterwards keeps it."""
+        status = " ".join(str(status).split())
+        if self._file.closed:
+            self._file = open(self.path, "a")
+        self._file.write("%s\t%s\n" % (case_number, status))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.status[case_number] = status
+
+    def close(self):
+        self._file.close()
+
+
+class CaseRunner(object):
+    """Streams cases through action(case_number, runner), checkpointing after each one.
+
+    Cases already in the checkpoint are skipped (failed ones too, unless retry_failed is set). An exception from
+    action fails that case only; its message goes into the checkpoint and the run carries on.
+    """
+
+    def __init__(self, action, checkpoint_path, retry_failed=False, progress_every=100, progress=print):
+        self.action = action
+        self.checkpoint = Checkpoint(checkpoint_path)
+        self.retry_failed = retry_failed
+        self.progress_every = progress_every
+        self.progress = progress
+        self.stages = {}
+        self.done = 0
+        self.failed = 0
+        self.skipped = 0
+        self.elapsed = 0.0
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        """Time part of the action; per-stage timings show up in report()."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages.setdefault(name, LatencyHistogram()).record(time.perf_counter() - started)
+
+    @property
+    def cases_per_minute(self):
+        """Throughput of the cases actually run so far."""
+        return (self.done + self.failed) * 60.0 / self.elapsed if self.elapsed else 0.0
+
+    def pending(self, cases):
+        """Filter out the cases the checkpoint says are finished."""
+        for case_number in cases:
+            status = self.checkpoint.status.get(case_number)
+            if status is None or (self.retry_failed and status != "ok"):
+                yield case_number
+            else:
+                self.skipped += 1
+
+    def run(self, cases):
+        """Run the action on every pending case and return the number run."""
+        try:
+            for case_number in self.pending(cases):
+                started = time.perf_counter()
+                try:
+                    with self.stage("case"):
+                        self.action(case_number, self)
+                except Exception as e:
+                    self.failed += 1
+                    self.checkpoint.record(case_number, "error: %s: %s" % (type(e).__name__, e))
+                else:
+                    self.done += 1
+                    self.checkpoint.record(case_number)
+                self.elapsed += time.perf_counter() - started
+                if self.progress and self.progress_every and (self.done + self.failed) % self.progress_every == 0:
+                    self.progress(self._progress_line())
+        finally:
+            self.checkpoint.close()
+        return self.done + self.failed
+
+    def _progress_line(self):
+        return "%d done, %d failed, %d skipped, %.1f cases/minute" % (self.done, self.failed, self.skipped, self.cases_per_minute)
+
+    def report(self):
+        """Return a text summary of throughput and stage timings."""
+        lines = [self._progress_line()]
+        for name in sorted(self.stages, key=lambda stage: -self.stages[stage].total):
+            timing = self.stages[name]
+            lines.append("  %-16s %6d x  mean %8.1f ms  p95 %8.1f ms  total %8.1f s" % (
+                name, timing.count, timing.mean * 1000, timing.percentile(95) * 1000, timing.total))
+        return "\n".join(lines)
@@ -0,0 +1,180 @@
+"""Declarative panel schemas: name each field of a panel once, then parse a whole snapshot into a typed record.
+
+Example::
+
+    STAT_JOBS = Schema("STAT/JOBS",
+                       case_number=Field(20, 38, 8, int),
+                       employer=Field(7, 42, 30, strip=" _"),
+                       start_date=Field(9, 35, 8, date()),
+                       hours=Field(18, 43, 3, int, blank=0))
+    jobs = STAT_JOBS.read()          # one Snapshot, every field
+    print(jobs.employer, jobs.start_date)
+
+The same schema works offline: STAT_JOBS.fields is a layout for extract.extract(), and convert() turns each
+extracted row into a record.
+
+To update a panel, edit() it and save(); only the fields that changed are written::
+
+    jobs = STAT_JOBS.edit()
+    jobs.hours = 40
+    jobs.save()                      # one WriteScreen, one transmit
+"""
+
+import collections
+import datetime
+import re
+
+import bzio
+
+from .screen import Screen, screen_offset, stats
+
+
+class Field(collections.namedtuple("Field", "row col length convert strip blank format")):
+    """Where a field is on the panel and how to turn its text into a value.
+
+    convert is called with the trimmed text (str, int, float, date() or any callable). strip is the characters
+    trimmed from both ends, None for whitespace or False to keep the text as it is. A field that is empty after
+    trimming becomes blank instead of being converted. format turns an edited value back into screen text; by
+    default the converter's own format (see date()) or str.
+    """
+
+    __slots__ = ()
+
+    def __new__(cls, row, col, length, convert=str, strip=None, blank=None, format=None):
+        return super(Field, cls).__new__(cls, row, col, length, convert, strip, blank, format)
+
+    def text(self, value):
+        """Return the screen text for value, or raise ValueError if it does not fit."""
+        if value is None or value == self.blank:
+            return ""
+        if not isinstance(value, str):
+            value = (self.format or getattr(self.convert, "format", str))(value)
+        if len(value) > self.length:
+            raise ValueError("%r is longer than the %d characters the field holds." % (value, self.length))
+        return value
+
+
+def date(format="%m %d %y"):
+    """Return a converter for dates shown as format (MAXIS shows them as MM DD YY), which formats them back too."""
+    def convert(text):
+        return datetime.datetime.strptime(text, format).date()
+    convert.format = lambda value: value.strftime(format)
+    return convert
+
+
+class Schema(object):
+    """A panel's fields, compiled to screen offsets so parsing a snapshot is one pass of string slices."""
+
+    def __init__(self, panel, **fields):
+        self.panel = panel
+        self.fields = dict((name, Field(*field)) for name, field in fields.items())
+        self.record = collections.namedtuple(re.sub(r"\W", "_", panel) or "Record", list(self.fields))
+        self._plan = [(name, screen_offset(field.length, field.row, field.col), field) for name, field in self.fields.items()]
+
+    def __repr__(self):
+        return "<Schema %s: %s>" % (self.panel, ", ".join(self.fields))
+
+    def parse(self, screen):
+        """Parse a Screen (or screen text) into a record."""
+        text = screen.text if isinstance(screen, Screen) else screen
+        return self.record(*[self._value(name, field, text[start:start + field.length]) for name, start, field in self._plan])
+
+    def convert(self, values):
+        """Build a record from raw field texts in schema order, e.g. rows of an extract.Table."""
+        return self.record(*[self._value(name, field, text) for (name, start, field), text in zip(self._plan, values)])
+
+    def read(self, session=None):
+        """Take one snapshot of the session (the module-level bzio session by default) and parse it."""
+        screen = (session if session is not None else bzio).Snapshot()
+        # Each field parsed is a ReadScreen the script did not have to make.
+        stats["snapshot_reads"] += len(self._plan)
+        return self.parse(screen)
+
+    def edit(self, session=None, screen=None):
+        """Return an EditablePanel over screen, or over one new snapshot of the session."""
+        session = session if session is not None else bzio
+        if screen is None:
+            screen = session.Snapshot()
+            stats["snapshot_reads"] += len(self._plan)
+        return EditablePanel(self, screen, session)
+
+    def _value(self, name, field, text):
+        if field.strip is not False:
+            text = text.strip(field.strip)
+        if not text:
+            return field.blank
+        try:
+            return field.convert(text)
+        except ValueError:
+            raise ValueError("%s %s: %r is not a valid value." % (self.panel, name, text))
+
+
+class EditablePanel(object):
+    """A panel's field values, read from one snapshot, that remembers which fields have been changed.
+
+    Fields are attributes (or items) named as in the schema. save() writes only the changed fields, padded to
+    the field length with the character the panel fills empty space with, so no old text is left behind.
+    """
+
+    def __init__(self, schema, screen, session):
+        text = screen.text if isinstance(screen, Screen) else screen
+        object.__setattr__(self, "schema", schema)
+        object.__setattr__(self, "session", session)
+        object.__setattr__(self, "_saved", schema.parse(text)._asdict())
+        object.__setattr__(self, "_values", dict(self._saved))
+        object.__setattr__(self, "_fill", dict((name, _fill_char(field, text[start:start + field.length]))
+                                               for name, start, field in schema._plan))
+
+    def __repr__(self):
+        return "<EditablePanel %s, changed: %s>" % (self.schema.panel, ", ".join(self.dirty) or "nothing")
+
+    def __getattr__(self, name):
+        if name.startswith("_") or name not in self._values:
+            raise AttributeError(name)
+        return self._values[name]
+
+    def __setattr__(self, name, value):
+        if name not in self._values:
+            raise AttributeError("%s has no field %s." % (self.schema.panel, name))
+        self.schema.fields[name].text(value)
+        self._values[name] = value
+
+    def __getitem__(self, name):
+        return self._values[name]
+
+    __setitem__ = __setattr__
+
+    @property
+    def dirty(self):
+        """Names of the fields changed since the panel was read or last saved, in schema order."""
+        return [name for name in self.schema.fields if self._values[name] != self._saved[name]]
+
+    def changes(self):
+        """Return {name: (old value, new value)} for the changed fields."""
+        return dict((name, (self._saved[name], self._values[name])) for name in self.dirty)
+
+    def revert(self):
+        """Put back the values the panel was read with."""
+        self._values.update(self._saved)
+
+    def save(self, key="<enter>", verify=True):
+        """Write the changed fields in one batch.WriteBatch and send key; returns how many fields were written.
+
+        Nothing is sent to the host when no field has changed.
+        """
+        dirty = self.dirty
+        if not dirty:
+            return 0
+        with self.session.write_batch(key, verify) as batch:
+            for name in dirty:
+                field = self.schema.fields[name]
+                batch.write(field.text(self._values[name]).ljust(field.length, self._fill[name]), field.row, field.col)
+        self._saved.update(self._values)
+        return len(dirty)
+
+
+def _fill_char(field, raw):
+    """The character the screen pads a field with: its trailing strip character (e.g. MAXIS's _), else a space."""
+    if raw and field.strip and raw[-1] in field.strip:
+        return raw[-1]
+    return " "
@@ -0,0 +1,106 @@
+"""Screen snapshots: read-only copies of the 24x80 host presentation space."""
+
+import collections
+
+ROWS = 24
+COLS = 80
+SCREEN_SIZE = ROWS * COLS
+
+# Counts of the snapshots a script took and of its reads that were served from them instead of the host. bzio's own
+# snapshots and reads (the read cache, navigation, write batches) are not counted, so they cannot skew calls_avoided().
+stats = collections.Counter()
+
+
+class Screen(object):
+    """Read-only copy of the host presentation space and cursor position."""
+
+    __slots__ = ("_text", "_cursor")
+
+    def __init__(self, text, cursor=(1, 1)):
+        text = text.ljust(SCREEN_SIZE)[:SCREEN_SIZE]
+        object.__setattr__(self, "_text", text)
+        object.__setattr__(self, "_cursor", (int(cursor[0]), int(cursor[1])))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Screen snapshots are read-only.")
+
+    def __delattr__(self, name):
+        raise AttributeError("Screen snapshots are read-only.")
+
+    def __eq__(self, other):
+        if not isinstance(other, Screen):
+            return NotImplemented
+        return self._text == other._text and self._cursor == other._cursor
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    def __hash__(self):
+        return hash((self._text, self._cursor))
+
+    def __repr__(self):
+        return "<Screen %r cursor=%s>" % (self._text[:COLS].rstrip(), self._cursor)
+
+    def __str__(self):
+        return "\n".join(self.rows())
+
+    @property
+    def text(self):
+        """The whole screen as one 1920 character string."""
+        return self._text
+
+    @property
+    def cursor(self):
+        """The cursor position as a (row, column) tuple."""
+        return self._cursor
+
+    def read(self, length, row, col):
+        """Return text from the snapshot, the same way ReadScreen reads it from the host."""
+        start = screen_offset(length, row, col)
+        stats["snapshot_reads"] += 1
+        return self._text[start:start + length]
+
+    def row(self, row):
+        """Return one full row (1-24) of the snapshot."""
+        return self.read(COLS, row, 1)
+
+    def rows(self, first=1, last=ROWS):
+        """Return rows first through last (inclusive) as a list of strings."""
+        return [self._text[(r - 1) * COLS:r * COLS] for r in _row_range(first, last)]
+
+    def region(self, top, left, bottom, right):
+        """Return the rectangle between two corners (inclusive) as a list of strings."""
+        if not 1 <= left <= right <= COLS:
+            raise ValueError("Either the row or column variable are too high.")
+        return [line[left - 1:right] for line in self.rows(top, bottom)]
+
+    # Aliases so code written against the module-level functions can read from a snapshot unchanged.
+    def ReadScreen(self, LengthVal, RowVal, ColumnVal):
+        """Retrieve data from the snapshot."""
+        return self.read(LengthVal, RowVal, ColumnVal)
+
+    def CursorRow(self):
+        """Return the cursor row at the time of the snapshot."""
+        return self._cursor[0]
+
+    def CursorCol(self):
+        """Return the cursor column at the time of the snapshot."""
+        return self._cursor[1]
+
+
+def screen_offset(length, row, col):
+    """Return the string offset of (row, col), checking the read stays on the screen."""
+    if length < 0 or not 1 <= row <= ROWS or not 1 <= col <= COLS:
+        raise ValueError("Either the row or column variable are too high.")
+    start = (row - 1) * COLS + col - 1
+    if start + length > SCREEN_SIZE:
+        raise ValueError("Either the row or column variable are too high.")
+    return start
+
+
+def _row_range(first, last):
+    if not 1 <= first <= last <= ROWS:
+        raise ValueError("Either the row or column variable are too high.")
+    return range(first, last + 1)
+
@@ -0,0 +1,88 @@
+"""Find many strings on a captured screen in one pass, instead of one host Search call per string."""
+
+import collections
+
+from .screen import COLS, Screen
+
+Hit = collections.namedtuple("Hit", "pattern row col")
+
+
+class PatternSet(object):
+    """Aho-Corasick automaton over a fixed set of patterns.
+
+    Build it once (e.g. at module level) and reuse it for every screen; finding all hits costs one pass over the
+    1920 characters no matter how many patterns there are.
+    """
+
+    def __init__(self, patterns):
+        self.patterns = tuple(patterns)
+        if not all(self.patterns):
+            raise ValueError("Search patterns must not be empty.")
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [()]
+        for pattern in self.patterns:
+            self._add(pattern)
+        self._link()
+
+    def _add(self, pattern):
+        state = 0
+        for char in pattern:
+            nxt = self._goto[state].get(char)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][char] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            state = nxt
+        if pattern not in self._out[state]:
+            self._out[state] += (pattern,)
+
+    def _link(self):
+        queue = collections.deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(char, 0)
+                self._out[nxt] += self._out[self._fail[nxt]]
+
+    def _scan(self, text):
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for index, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for pattern in out[state]:
+                yield pattern, index - len(pattern) + 1
+
+    def finditer(self, screen):
+        """Yield a Hit for every occurrence of every pattern, ordered by where it ends; matches may wrap across rows."""
+        text = screen.text if isinstance(screen, Screen) else screen
+        for pattern, start in self._scan(text):
+            yield Hit(pattern, start // COLS + 1, start % COLS + 1)
+
+    def findall(self, screen):
+        """Return {pattern: [(row, col), ...]} with an entry for every pattern, empty if it is not on the screen."""
+        found = dict((pattern, []) for pattern in self.patterns)
+        for hit in self.finditer(screen):
+            found[hit.pattern].append((hit.row, hit.col))
+        return found
+
+    def first(self, screen):
+        """Return the Hit that starts earliest on the screen, or None."""
+        return min(self.finditer(screen), key=lambda hit: (hit.row, hit.col), default=None)
+
+    def present(self, screen):
+        """Return the set of patterns that appear on the screen."""
+        return set(hit.pattern for hit in self.finditer(screen))
+
+
+def search_all(screen, patterns):
+    """Find every position of every pattern on a screen in one pass; see PatternSet for repeated use."""
+    return PatternSet(patterns).findall(screen)
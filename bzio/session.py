@@ -0,0 +1,311 @@
+"""A host session object carrying every bzio function as a method, so several sessions can be driven at once."""
+
+import contextlib
+import functools
+import time
+
+from . import backends
+from .batch import WriteBatch
+from .screen import COLS, SCREEN_SIZE, Screen, screen_offset, stats
+from .search import PatternSet
+from .timing import LatencyHistogram
+
+# Polling intervals for the wait_for_* methods, in seconds: start quickly and back off while the host is slow.
+POLL_FIRST = 0.01
+POLL_MAX = 0.5
+POLL_BACKOFF = 1.5
+
+
+class Session(object):
+    """One connected host screen.
+
+    The module-level bzio functions are a shared default Session; create more to drive other screens, e.g.
+    Session("B"). Each new Session gets its own BlueZone automation object unless a backend or connection is given.
+    """
+
+    def __init__(self, screen_to_connect=None, backend=None, connection=None):
+        if connection is None:
+            connection = backends.Connection(functools.partial(backends.ComBackend, shared=False))
+            if backend is not None:
+                connection.use(backend)
+        self.connection = connection
+        # How long the host took per transaction, recorded by Transmit and the wait_for_* methods.
+        self.transaction_latency = LatencyHistogram()
+        # Opt-in read cache: when enabled, reads come from one snapshot until something changes the host screen.
+        self._cache_enabled = False
+        self._cached_screen = None
+        # The PendingScreen of a key sent ahead; the next host call waits for it first.
+        self._pending = None
+        if screen_to_connect is not None:
+            self.Connect(screen_to_connect)
+
+    def __repr__(self):
+        return "<Session %r>" % (self.connection.session,)
+
+    def Connect(self, screen_to_connect):
+        """Connect to a BlueZone Screen."""
+        self._invalidate_cache()
+        self._pending = None
+        self.connection.connect(screen_to_connect)
+        # TODO: error if not connected?
+
+    def Focus(self):
+        """Bring the BlueZone Display session window into the foreground."""
+        self._host().focus()
+
+    def CursorCol(self):
+        """Return current cursor column of the connected BZ screen."""
+        if self._cache_enabled:
+            return self._cached_screen_or_snapshot().CursorCol()
+        return self._host().get_cursor()[1]
+
+    def CursorRow(self):
+        """Return current cursor row of the connected BZ screen."""
+        if self._cache_enabled:
+            return self._cached_screen_or_snapshot().CursorRow()
+        return self._host().get_cursor()[0]
+
+    def GetCursor(self):
+        """Return the cursor position as (row, column), in one host call instead of CursorRow() plus CursorCol()."""
+        if self._cache_enabled:
+            return self._cached_screen_or_snapshot().cursor
+        return tuple(self._host().get_cursor())
+
+    def MsgBox(self, message_to_deliver):
+        """Display a simple pop-up box from within the BlueZone window."""
+        self._host().msg_box(message_to_deliver)
+
+    def ReadScreen(self, LengthVal, RowVal, ColumnVal):
+        """Retrieve data from the host screen."""
+        if self._cache_enabled:
+            start = screen_offset(LengthVal, RowVal, ColumnVal)
+            return self._cached_screen_or_snapshot().text[start:start + LengthVal]
+        return self._host().read_screen(LengthVal, RowVal, ColumnVal)
+
+    def Search(self, SearchStr):
+        """Search the host screen for some specified text."""
+        return self._host().search(SearchStr)
+
+    def SendKey(self, KeyStr):
+        """Send a sequence of keys to the display session."""
+        self._invalidate_cache()
+        self._host().send_key(KeyStr)
+
+    def SetCursor(self, RowVal, ColumnVal):
+        """Set the host screen cursor position."""
+        self._invalidate_cache()
+        self._host().set_cursor(RowVal, ColumnVal)
+
+    def Snapshot(self):
+        """Capture the whole host screen and cursor position so many fields can be read from one host round trip."""
+        stats["snapshots"] += 1
+        return self._take_snapshot()
+
+    def Transmit(self):
+        """Send a transmit key and wait until the window refreshes."""
+        started = time.perf_counter()
+        self.SendKey("<enter>")
+        self.WaitReady(0, 0)
+        self.transaction_latency.record(time.perf_counter() - started)
+
+    def WaitReady(self, TimeoutVal, ExtraWaitVal):
+        """Suspend script execution until the host screen is ready for keyboard input."""
+        # The screen may still have been repainting when it was cached, so start fresh once it settles.
+        self._invalidate_cache()
+        self._host().wait_ready(TimeoutVal, ExtraWaitVal)
+
+    def WriteScreen(self, WriteStr, RowVal, ColumnVal):
+        """Paste the specified text into the host screen."""
+        self._invalidate_cache()
+        self._host().write_screen(WriteStr, RowVal, ColumnVal)
+
+    def read_text(self):
+        """Return the whole screen text in one host call, bypassing the read cache; Snapshot also reads the cursor."""
+        return self._read_whole_screen()
+
+    def search_screen(self, patterns):
+        """Find every position of several strings with one screen read, instead of a Search call per string.
+
+        patterns is a search.PatternSet (build it once for patterns checked often) or any iterable of strings.
+        Returns {pattern: [(row, col), ...]}.
+        """
+        if not isinstance(patterns, PatternSet):
+            patterns = PatternSet(patterns)
+        screen = self._cached_screen_or_snapshot().text if self._cache_enabled else self._read_whole_screen()
+        return patterns.findall(screen)
+
+    def wait_for_text(self, text, row=None, col=None, timeout=30.0):
+        """Wait until text is on the screen, at (row, col) if given or anywhere in row if only row is given.
+
+        Returns the seconds waited, or raises TimeoutError.
+        """
+        started = time.perf_counter()
+        self._poll(lambda screen: _text_at(screen, text, row, col), started, timeout, "%r to appear" % text)
+        return self._finish_wait(started)
+
+    def wait_for_change(self, since=None, timeout=30.0):
+        """Wait until the screen differs from since (a Screen or screen text, default the screen right now).
+
+        Returns the seconds waited, or raises TimeoutError.
+        """
+        started = time.perf_counter()
+        if since is None:
+            since = self._read_whole_screen()
+        before = since.text if isinstance(since, Screen) else since
+        self._poll(lambda screen: screen != before, started, timeout, "the screen to change")
+        return self._finish_wait(started)
+
+    def transmit_until(self, text, row=None, col=None, timeout=30.0):
+        """Transmit, then wait for text the same way wait_for_text does instead of a fixed WaitReady(0, 0).
+
+        Text already on the screen before the transmit does not count: the screen has to change first, so a
+        panel header that stays put is not mistaken for the host's answer.
+        """
+        before = self._read_whole_screen()
+        started = time.perf_counter()
+        self.SendKey("<enter>")
+        changed = []
+
+        def arrived(screen):
+            if not changed and screen != before:
+                changed.append(True)
+            return bool(changed) and _text_at(screen, text, row, col)
+
+        self._poll(arrived, started, timeout, "%r to appear" % text)
+        return self._finish_wait(started)
+
+    def write_batch(self, key="<enter>", verify=True):
+        """Return a batch.WriteBatch that sends queued field writes together, then key, then checks the fields."""
+        return WriteBatch(self, key, verify)
+
+    def send_ahead(self, key="<enter>"):
+        """Send key without waiting for the host, and return a PendingScreen for the screen it brings back.
+
+        Local work done before PendingScreen.result() overlaps the host's processing. Any other call on this
+        session waits for the host first, so reads never see a screen that is still being painted.
+        """
+        pending = PendingScreen(self, key)
+        self._pending = pending
+        return pending
+
+    def use_backend(self, new_backend):
+        """Send every call on this session to new_backend, e.g. an emulator.Emulator, and return the previous backend."""
+        self._invalidate_cache()
+        self._pending = None
+        return self.connection.use(new_backend)
+
+    def enable_cache(self, enabled=True):
+        """Turn the read cache for ReadScreen, CursorRow and CursorCol on or off."""
+        self._cache_enabled = enabled
+        self._invalidate_cache()
+
+    @contextlib.contextmanager
+    def caching(self):
+        """Enable the read cache for the duration of a with block."""
+        previous = self._cache_enabled
+        self.enable_cache(True)
+        try:
+            yield
+        finally:
+            self.enable_cache(previous)
+
+    def _host(self):
+        """Return the current backend, starting it if this is the first host call."""
+        if self._pending is not None:
+            pending, self._pending = self._pending, None
+            pending._wait(0)
+        return self.connection.host()
+
+    def _take_snapshot(self):
+        """Snapshot for bzio's own use, left out of the snapshot counts that calls_avoided() is worked out from."""
+        host = self._host()
+        text = host.read_screen(SCREEN_SIZE, 1, 1)
+        return Screen(text, host.get_cursor())
+
+    def _read_whole_screen(self):
+        """Read the whole screen text in a single host call, bypassing the cache."""
+        return self._host().read_screen(SCREEN_SIZE, 1, 1)
+
+    def _poll(self, matches, started, timeout, waiting_for):
+        """Re-read the screen with growing intervals until matches(screen text) is true."""
+        interval = POLL_FIRST
+        while True:
+            if matches(self._read_whole_screen()):
+                return
+            remaining = started + timeout - time.perf_counter()
+            if remaining <= 0:
+                self._invalidate_cache()
+                raise TimeoutError("Gave up after %.1f seconds waiting for %s." % (timeout, waiting_for))
+            time.sleep(min(interval, remaining))
+            interval = min(interval * POLL_BACKOFF, POLL_MAX)
+
+    def _finish_wait(self, started):
+        """Record how long a wait took and drop any screen cached before the host changed."""
+        elapsed = time.perf_counter() - started
+        self.transaction_latency.record(elapsed)
+        self._invalidate_cache()
+        return elapsed
+
+    def _cached_screen_or_snapshot(self):
+        """Return the cached screen, taking a new snapshot if the host has changed since the last one."""
+        if self._cached_screen is None:
+            stats["cache_misses"] += 1
+            self._cached_screen = self._take_snapshot()
+        else:
+            stats["cache_hits"] += 1
+        return self._cached_screen
+
+    def _invalidate_cache(self):
+        """Forget the cached screen after a call that may change the host."""
+        self._cached_screen = None
+
+
+class PendingScreen(object):
+    """The screen a key sent with Session.send_ahead will bring back.
+
+    result() waits for the host and snapshots the screen the first time it is called. waited is how long the wait
+    took; the rest of the host's time since sent was hidden behind the script's own work. Another call on the
+    session only waits for the host, and result() then snapshots the screen as it is at that point.
+    """
+
+    def __init__(self, session, key):
+        self.session = session
+        self.key = key
+        session.SendKey(key)
+        self.sent = time.perf_counter()
+        self.waited = None
+        self._screen = None
+
+    def done(self):
+        """Whether the host has already been waited for."""
+        return self.waited is not None
+
+    def result(self, timeout=0):
+        """Wait until the host is ready (WaitReady's timeout, 0 for the default) and return the new Screen."""
+        if self._screen is None:
+            self._wait(timeout)
+            screen = self.session.Snapshot()
+            if self.session._cache_enabled:
+                self.session._cached_screen = screen
+            self._screen = screen
+        return self._screen
+
+    def _wait(self, timeout):
+        """Wait until the host is ready, without reading the screen."""
+        if self.waited is None:
+            started = time.perf_counter()
+            if self.session._pending is self:
+                self.session._pending = None
+            self.session.WaitReady(timeout, 0)
+            self.waited = time.perf_counter() - started
+
+
+def _text_at(screen, text, row, col):
+    """Whether text is in the screen text at (row, col), in row, or anywhere."""
+    if row is None:
+        return text in screen
+    start = (row - 1) * COLS
+    if col is None:
+        return text in screen[start:start + COLS]
+    start += col - 1
+    return screen[start:start + len(text)] == text
@@ -0,0 +1,85 @@
+"""Latency bookkeeping for host transactions."""
+
+import bisect
+import math
+
+# Upper bounds of the histogram buckets, in seconds. Anything slower lands in a final overflow bucket.
+BUCKET_BOUNDS = (0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0)
+
+
+class LatencyHistogram(object):
+    """Counts of durations in fixed, roughly logarithmic buckets, cheap enough to record every transaction."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Forget everything recorded so far."""
+        self.counts = [0] * (len(BUCKET_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = 0.0
+
+    def record(self, seconds):
+        """Add one duration."""
+        self.counts[bisect.bisect_left(BUCKET_BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.min = seconds if self.min is None else min(self.min, seconds)
+
+    @property
+    def mean(self):
+        """Average duration, or 0.0 if nothing has been recorded."""
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, pct):
+        """Return the upper bound of the bucket holding the pct-th percentile (0-100), capped at the slowest duration."""
+        if not self.count:
+            return 0.0
+        wanted = max(1, int(round(self.count * pct / 100.0)))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= wanted:
+                break
+        if index == len(BUCKET_BOUNDS):
+            return self.max
+        return min(BUCKET_BOUNDS[index], self.max)
+
+    def buckets(self):
+        """Return (upper bound in seconds, count) pairs for the non-empty buckets; the overflow bound is None."""
+        bounds = BUCKET_BOUNDS + (None,)
+        return [(bounds[i], count) for i, count in enumerate(self.counts) if count]
+
+    def __str__(self):
+        lines = ["%d transactions, mean %.1f ms, max %.1f ms" % (self.count, self.mean * 1000, self.max * 1000)]
+        for bound, count in self.buckets():
+            label = "<= %g ms" % (bound * 1000) if bound is not None else "> %g ms" % (BUCKET_BOUNDS[-1] * 1000)
+            lines.append("  %-12s %d" % (label, count))
+        return "\n".join(lines)
+
+
+class LatencySamples(LatencyHistogram):
+    """A LatencyHistogram that also keeps every duration, so percentiles are exact; for load tests, not long runs."""
+
+    def reset(self):
+        super(LatencySamples, self).reset()
+        self.samples = []
+
+    def record(self, seconds):
+        super(LatencySamples, self).record(seconds)
+        self.samples.append(seconds)
+
+    def merge(self, other):
+        """Add every duration recorded by another LatencySamples."""
+        for seconds in other.samples:
+            self.record(seconds)
+
+    def percentile(self, pct):
+        """Return the pct-th percentile (0-100) duration, by nearest rank."""
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[max(1, int(math.ceil(len(ordered) * pct / 100.0))) - 1]
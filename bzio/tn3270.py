@@ -0,0 +1,574 @@
+"""Headless TN3270 backend: talks to the host directly over telnet, with no BlueZone window.
+
+Example::
+
+    bzio.use_backend(TN3270Backend("mainframe.example", 23))
+    bzio.Connect("")
+    print(bzio.ReadScreen(40, 24, 2))
+
+This is basic TN3270 (RFC 1576) for a 24x80 model 2 terminal: no TN3270E, colours or structured fields.
+See tn3270host.StandInHost for a local host to try it against.
+"""
+
+import bisect
+import re
+import socket
+import threading
+import time
+
+from .backends import Backend
+from .screen import COLS, SCREEN_SIZE, screen_offset
+
+ENCODING = "cp037"
+TERMINAL_TYPE = b"IBM-3278-2"
+
+# Seconds to wait for the keyboard to unlock when WaitReady is given no timeout.
+DEFAULT_TIMEOUT = 30.0
+
+# Telnet commands and options.
+IAC, DONT, DO, WONT, WILL, SB, SE, EOR_MARK = 255, 254, 253, 252, 251, 250, 240, 239
+BINARY, TTYPE, EOR = 0, 24, 25
+TTYPE_IS, TTYPE_SEND = 0, 1
+
+# 3270 commands, in both their SNA and channel forms.
+WRITE = frozenset([0xF1, 0x01])
+ERASE_WRITE = frozenset([0xF5, 0x05, 0x7E, 0x0D])
+ERASE_ALL_UNPROTECTED = frozenset([0x6F, 0x0F])
+READ_BUFFER = frozenset([0xF2, 0x02])
+READ_MODIFIED = frozenset([0xF6, 0x06, 0x6E, 0x0E])
+
+# Orders in a write data stream.
+SF, SFE, SBA, SA, MF, IC, PT, RA, EUA, GE = 0x1D, 0x29, 0x11, 0x28, 0x2C, 0x13, 0x05, 0x3C, 0x12, 0x08
+
+# Write control character bits.
+WCC_RESTORE = 0x02
+WCC_RESET_MDT = 0x01
+
+# Field attribute bits.
+PROTECTED = 0x20
+NUMERIC = 0x10
+NONDISPLAY = 0x0C
+MDT = 0x01
+# Protected and numeric together: the cursor skips over the field to the next input field.
+AUTOSKIP = PROTECTED | NUMERIC
+
+# Attention identifiers sent for each bzio key mnemonic.
+AIDS = {"<enter>": 0x7D, "<clear>": 0x6D, "<pa1>": 0x6C, "<pa2>": 0x6E, "<pa3>": 0x6B}
+AIDS.update(("<pf%d>" % n, code) for n, code in enumerate(b"\xf1\xf2\xf3\xf4\xf5\xf6\xf7\xf8\xf9\x7a\x7b\x7c"
+                                                           b"\xc1\xc2\xc3\xc4\xc5\xc6\xc7\xc8\xc9\x4a\x4b\x4c", 1))
+NO_AID = 0x60
+# Keys that send only the AID, without the cursor or any field data.
+SHORT_READ = frozenset([AIDS["<clear>"], AIDS["<pa1>"], AIDS["<pa2>"], AIDS["<pa3>"]])
+
+# The six-bit codes used for 12-bit buffer addresses and field attribute bytes.
+ADDRESS_CODES = bytes([0x40, 0xC1, 0xC2, 0xC3, 0xC4, 0xC5, 0xC6, 0xC7, 0xC8, 0xC9, 0x4A, 0x4B, 0x4C, 0x4D, 0x4E, 0x4F,
+                       0x50, 0xD1, 0xD2, 0xD3, 0xD4, 0xD5, 0xD6, 0xD7, 0xD8, 0xD9, 0x5A, 0x5B, 0x5C, 0x5D, 0x5E, 0x5F,
+                       0x60, 0x61, 0xE2, 0xE3, 0xE4, 0xE5, 0xE6, 0xE7, 0xE8, 0xE9, 0x6A, 0x6B, 0x6C, 0x6D, 0x6E, 0x6F,
+                       0xF0, 0xF1, 0xF2, 0xF3, 0xF4, 0xF5, 0xF6, 0xF7, 0xF8, 0xF9, 0x7A, 0x7B, 0x7C, 0x7D, 0x7E, 0x7F])
+
+_KEY_TOKENS = re.compile(r"<[^<>]+>|.", re.DOTALL)
+_SPACE = 0x40
+
+
+def encode_address(position):
+    """Encode a buffer position (0-1919) as two bytes of 12-bit address."""
+    return bytes([ADDRESS_CODES[position >> 6], ADDRESS_CODES[position & 0x3F]])
+
+
+def decode_address(first, second):
+    """Decode a 12-bit or 14-bit buffer address."""
+    if first & 0xC0 == 0:
+        return ((first & 0x3F) << 8 | second) % SCREEN_SIZE
+    return ((first & 0x3F) << 6 | second & 0x3F) % SCREEN_SIZE
+
+
+class Telnet(object):
+    """Telnet framing for TN3270: splits incoming bytes into 3270 records and option negotiation.
+
+    Subclasses handle record(), command() and subnegotiation().
+    """
+
+    _DATA, _IAC, _OPTION, _SUB, _SUB_IAC = range(5)
+
+    def __init__(self, sock):
+        self.sock = sock
+        self._state = self._DATA
+        self._record = bytearray()
+        self._sub = bytearray()
+        self._command = None
+        self._send_lock = threading.Lock()
+
+    def record(self, data):
+        """Handle one complete 3270 record."""
+
+    def command(self, command, option):
+        """Handle DO, DONT, WILL or WONT for option."""
+
+    def subnegotiation(self, payload):
+        """Handle the bytes between IAC SB and IAC SE."""
+
+    def feed(self, data):
+        """Parse bytes received from the socket."""
+        pos = 0
+        while pos < len(data):
+            if self._state == self._DATA:
+                found = data.find(b"\xff", pos)
+                if found < 0:
+                    self._record += data[pos:]
+                    return
+                self._record += data[pos:found]
+                pos = found + 1
+                self._state = self._IAC
+                continue
+            byte = data[pos]
+            pos += 1
+            if self._state == self._IAC:
+                self._state = self._DATA
+                if byte == IAC:
+                    self._record.append(IAC)
+                elif byte == EOR_MARK:
+                    record, self._record = bytes(self._record), bytearray()
+                    self.record(record)
+                elif byte in (DO, DONT, WILL, WONT):
+                    self._command = byte
+                    self._state = self._OPTION
+                elif byte == SB:
+                    self._sub = bytearray()
+                    self._state = self._SUB
+            elif self._state == self._OPTION:
+                self._state = self._DATA
+                self.command(self._command, byte)
+            elif self._state == self._SUB:
+                if byte == IAC:
+                    self._state = self._SUB_IAC
+                else:
+                    self._sub.append(byte)
+            else:
+                self._state = self._SUB
+                if byte == SE:
+                    self._state = self._DATA
+                    self.subnegotiation(bytes(self._sub))
+                elif byte == IAC:
+                    self._sub.append(IAC)
+
+    def send(self, data):
+        with self._send_lock:
+            self.sock.sendall(data)
+
+    def send_command(self, command, option):
+        self.send(bytes([IAC, command, option]))
+
+    def send_subnegotiation(self, payload):
+        self.send(bytes([IAC, SB]) + payload.replace(b"\xff", b"\xff\xff") + bytes([IAC, SE]))
+
+    def send_record(self, data):
+        self.send(data.replace(b"\xff", b"\xff\xff") + bytes([IAC, EOR_MARK]))
+
+
+class _ClientTelnet(Telnet):
+    """Agrees to binary, end-of-record and terminal type, and refuses everything else (including TN3270E)."""
+
+    def __init__(self, sock, backend):
+        super(_ClientTelnet, self).__init__(sock)
+        self.backend = backend
+        self._answered = set()
+
+    def record(self, data):
+        self.backend._host_record(data)
+
+    def command(self, command, option):
+        if command == DO:
+            reply = WILL if option in (BINARY, EOR, TTYPE) else WONT
+        elif command == WILL:
+            reply = DO if option in (BINARY, EOR) else DONT
+        else:
+            return
+        # Answer each request once, so two agreeable ends do not echo each other forever.
+        if (reply, option) not in self._answered:
+            self._answered.add((reply, option))
+            self.send_command(reply, option)
+
+    def subnegotiation(self, payload):
+        if payload[:2] == bytes([TTYPE, TTYPE_SEND]):
+            self.send_subnegotiation(bytes([TTYPE, TTYPE_IS]) + self.backend.terminal_type)
+
+
+class TN3270Backend(Backend):
+    """A 24x80 3270 terminal in memory, connected straight to a TN3270 host.
+
+    host and port are where to connect; Connect("host:port") may name another address instead. A background
+    thread applies the host's writes as they arrive. AID keys lock the keyboard until the host unlocks it, and
+    WaitReady waits for that. MsgBox has no window to show, so messages are kept in messages.
+    """
+
+    def __init__(self, host="127.0.0.1", port=23, timeout=DEFAULT_TIMEOUT):
+        self.address = (host, port)
+        self.timeout = timeout
+        self.messages = []
+        self.terminal_type = TERMINAL_TYPE
+        self._lock = threading.Condition()
+        self._sock = None
+        self._telnet = None
+        self._reader = None
+        self._closed = True
+        self._buffer = bytearray(SCREEN_SIZE)
+        self._attributes = [None] * SCREEN_SIZE
+        self._starts = []
+        self._cursor = 0
+        self._locked = True
+        self._aid = NO_AID
+
+    def close(self):
+        """Drop the connection to the host, once its reader thread has stopped."""
+        sock, reader = self._sock, self._reader
+        if sock is None:
+            return
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        if reader is not None and reader is not threading.current_thread():
+            reader.join()
+        sock.close()
+        with self._lock:
+            if self._sock is sock:
+                self._sock = None
+                self._reader = None
+                self._closed = True
+
+    # Backend operations.
+
+    def connect(self, screen_to_connect):
+        if screen_to_connect and ":" in screen_to_connect:
+            host, port = screen_to_connect.rsplit(":", 1)
+            self.address = (host, int(port))
+        self.close()
+        sock = socket.create_connection(self.address, self.timeout)
+        sock.settimeout(None)
+        # Records are small and each one waits for an answer, so send them at once.
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        telnet = _ClientTelnet(sock, self)
+        reader = threading.Thread(target=self._read_loop, args=(sock, telnet), name="tn3270 %s:%d" % self.address)
+        reader.daemon = True
+        with self._lock:
+            self._sock, self._telnet, self._reader = sock, telnet, reader
+            self._closed = False
+            self._locked = True
+        reader.start()
+        self._wait_unlocked(self.timeout)
+
+    def focus(self):
+        pass
+
+    def msg_box(self, message):
+        self.messages.append(message)
+
+    def read_screen(self, length, row, col):
+        start = screen_offset(length, row, col)
+        with self._lock:
+            return self._text()[start:start + length]
+
+    def write_screen(self, text, row, col):
+        start = screen_offset(len(text), row, col)
+        with self._lock:
+            for position, char in enumerate(text, start):
+                self._type(position, char)
+
+    def send_key(self, keys):
+        for token in _KEY_TOKENS.findall(keys):
+            # Like a real terminal's type-ahead, keys after an AID wait for the host to unlock the keyboard.
+            self._wait_unlocked(self.timeout)
+            with self._lock:
+                if len(token) == 1:
+                    self._type_at_cursor(token)
+                else:
+                    self._key(token.lower())
+
+    def wait_ready(self, timeout, extra_wait):
+        self._wait_unlocked(timeout or DEFAULT_TIMEOUT)
+        if extra_wait:
+            time.sleep(extra_wait / 1000.0)
+
+    def search(self, text):
+        with self._lock:
+            found = self._text().find(text)
+        if found < 0:
+            return 1, 0, 0
+        return 0, found // COLS + 1, found % COLS + 1
+
+    def get_cursor(self):
+        with self._lock:
+            return self._cursor // COLS + 1, self._cursor % COLS + 1
+
+    def set_cursor(self, row, col):
+        position = screen_offset(0, row, col)
+        with self._lock:
+            self._cursor = position
+
+    # Network side.
+
+    def _read_loop(self, sock, telnet):
+        # Each connection has its own reader, which only ever touches the state of its own connection.
+        try:
+            while True:
+                data = sock.recv(65536)
+                if not data:
+                    break
+                telnet.feed(data)
+        except OSError:
+            pass
+        finally:
+            with self._lock:
+                if self._sock is sock:
+                    self._closed = True
+                self._lock.notify_all()
+
+    def _wait_unlocked(self, timeout):
+        deadline = time.perf_counter() + timeout
+        with self._lock:
+            while self._locked:
+                if self._closed:
+                    raise ConnectionError("The host at %s:%d closed the connection." % self.address)
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    raise TimeoutError("Gave up after %.1f seconds waiting for the keyboard to unlock." % timeout)
+                self._lock.wait(remaining)
+
+    def _host_record(self, data):
+        """Apply one record from the host."""
+        if not data:
+            return
+        with self._lock:
+            command = data[0]
+            if command in WRITE or command in ERASE_WRITE:
+                self._write(data, command in ERASE_WRITE)
+            elif command in ERASE_ALL_UNPROTECTED:
+                self._erase_unprotected()
+            elif command in READ_BUFFER:
+                self._telnet.send_record(self._read_buffer())
+            elif command in READ_MODIFIED:
+                self._telnet.send_record(self._read_modified(self._aid))
+            self._lock.notify_all()
+
+    def _send_aid(self, key):
+        aid = AIDS[key]
+        if aid == AIDS["<clear>"]:
+            self._clear()
+        record = bytes([aid]) if aid in SHORT_READ else self._read_modified(aid)
+        self._aid = aid
+        self._locked = True
+        self._telnet.send_record(record)
+
+    # The 3270 buffer. Everything below runs with self._lock held.
+
+    def _clear(self):
+        self._buffer = bytearray(SCREEN_SIZE)
+        self._attributes = [None] * SCREEN_SIZE
+        self._starts = []
+        self._cursor = 0
+
+    def _write(self, data, erase):
+        if erase:
+            self._clear()
+        if len(data) < 2:
+            return
+        wcc = data[1]
+        if wcc & WCC_RESET_MDT:
+            self._attributes = [a & ~MDT if a is not None else None for a in self._attributes]
+        position = 0 if erase else self._cursor
+        pos = 2
+        while pos < len(data):
+            order = data[pos]
+            if order == SF:
+                self._set_attribute(position, data[pos + 1])
+                position, pos = (position + 1) % SCREEN_SIZE, pos + 2
+            elif order == SFE:
+                count = data[pos + 1]
+                pairs = data[pos + 2:pos + 2 + 2 * count]
+                attribute = next((pairs[i + 1] for i in range(0, len(pairs) - 1, 2) if pairs[i] == 0xC0), 0)
+                self._set_attribute(position, attribute)
+                position, pos = (position + 1) % SCREEN_SIZE, pos + 2 + 2 * count
+            elif order == SBA:
+                position, pos = decode_address(data[pos + 1], data[pos + 2]), pos + 3
+            elif order == IC:
+                self._cursor, pos = position, pos + 1
+            elif order == PT:
+                found = self._next_input(position - 1)
+                position, pos = (found if found is not None else 0), pos + 1
+            elif order in (RA, EUA):
+                stop = decode_address(data[pos + 1], data[pos + 2])
+                if order == RA:
+                    char, pos = (data[pos + 4], pos + 5) if data[pos + 3] == GE else (data[pos + 3], pos + 4)
+                else:
+                    char, pos = None, pos + 3
+                while True:
+                    if char is not None:
+                        self._put(position, char)
+                    elif not self._protected(position):
+                        self._buffer[position] = 0
+                    position = (position + 1) % SCREEN_SIZE
+                    if position == stop:
+                        break
+            elif order == SA:
+                pos += 3
+            elif order == MF:
+                pos += 2 + 2 * data[pos + 1]
+            elif order == GE:
+                self._put(position, data[pos + 1])
+                position, pos = (position + 1) % SCREEN_SIZE, pos + 2
+            else:
+                self._put(position, order)
+                position, pos = (position + 1) % SCREEN_SIZE, pos + 1
+        self._starts = [p for p, attribute in enumerate(self._attributes) if attribute is not None]
+        if wcc & WCC_RESTORE:
+            self._locked = False
+            self._aid = NO_AID
+
+    def _erase_unprotected(self):
+        for start, positions in self._fields():
+            if not self._attributes[start] & PROTECTED:
+                self._attributes[start] &= ~MDT
+                for position in positions:
+                    self._buffer[position] = 0
+        found = self._next_input(-1)
+        self._cursor = found if found is not None else 0
+        self._locked = False
+        self._aid = NO_AID
+
+    def _set_attribute(self, position, attribute):
+        self._attributes[position] = attribute
+        self._buffer[position] = 0
+
+    def _put(self, position, char):
+        self._attributes[position] = None
+        self._buffer[position] = char
+
+    def _fields(self):
+        """Yield (attribute position, [positions in the field]) for each field."""
+        starts = self._starts
+        for n, start in enumerate(starts):
+            end = starts[n + 1] if n + 1 < len(starts) else starts[0] + SCREEN_SIZE
+            yield start, [p % SCREEN_SIZE for p in range(start + 1, end)]
+
+    def _field_start(self, position):
+        """The attribute position of the field holding position, or None on an unformatted screen."""
+        if not self._starts:
+            return None
+        return self._starts[bisect.bisect_right(self._starts, position) - 1]
+
+    def _protected(self, position):
+        if self._attributes[position] is not None:
+            return True
+        start = self._field_start(position)
+        return start is not None and bool(self._attributes[start] & PROTECTED)
+
+    def _next_input(self, after):
+        """The first character of the next unprotected field after position after, wrapping around.
+
+        None when there is no such field, including on an unformatted screen.
+        """
+        firsts = [(start + 1) % SCREEN_SIZE for start in self._starts
+                  if not self._attributes[start] & PROTECTED and self._attributes[(start + 1) % SCREEN_SIZE] is None]
+        if not firsts:
+            return None
+        later = [first for first in firsts if first > after]
+        return min(later) if later else min(firsts)
+
+    def _type(self, position, char):
+        if self._protected(position):
+            return False
+        self._buffer[position] = char.encode(ENCODING, "replace")[0]
+        start = self._field_start(position)
+        if start is not None:
+            self._attributes[start] |= MDT
+        return True
+
+    def _type_at_cursor(self, char):
+        if not self._type(self._cursor, char):
+            return
+        self._cursor = (self._cursor + 1) % SCREEN_SIZE
+        attribute = self._attributes[self._cursor]
+        if attribute is not None and attribute & AUTOSKIP == AUTOSKIP:
+            found = self._next_input(self._cursor)
+            self._cursor = found if found is not None else self._cursor
+
+    def _key(self, key):
+        cursor = self._cursor
+        if key in AIDS:
+            self._send_aid(key)
+        elif key == "<tab>":
+            found = self._next_input(cursor)
+            self._cursor = found if found is not None else 0
+        elif key == "<backtab>":
+            start = self._field_start(cursor)
+            if start is not None and cursor != (start + 1) % SCREEN_SIZE and not self._protected(cursor):
+                self._cursor = (start + 1) % SCREEN_SIZE
+            else:
+                found = self._previous_input(cursor)
+                self._cursor = found if found is not None else 0
+        elif key == "<home>":
+            found = self._next_input(-1)
+            self._cursor = found if found is not None else 0
+        elif key == "<newline>":
+            next_row = (cursor // COLS + 1) * COLS
+            found = self._next_input(next_row - 1)
+            self._cursor = found if found is not None else next_row % SCREEN_SIZE
+        elif key == "<eraseeof>":
+            self._erase_to_field_end(cursor)
+        elif key in ("<up>", "<down>", "<left>", "<right>"):
+            step = {"<up>": -COLS, "<down>": COLS, "<left>": -1, "<right>": 1}[key]
+            self._cursor = (cursor + step) % SCREEN_SIZE
+        else:
+            raise ValueError("The TN3270 backend does not know the key %s." % key)
+
+    def _previous_input(self, before):
+        firsts = sorted((start + 1) % SCREEN_SIZE for start in self._starts if not self._attributes[start] & PROTECTED)
+        if not firsts:
+            return None
+        earlier = [first for first in firsts if first < before]
+        return max(earlier) if earlier else max(firsts)
+
+    def _erase_to_field_end(self, position):
+        if self._protected(position):
+            return
+        start = self._field_start(position)
+        while self._attributes[position] is None:
+            self._buffer[position] = 0
+            position += 1
+            if position == SCREEN_SIZE:
+                if start is None:
+                    break
+                position = 0
+        if start is not None:
+            self._attributes[start] |= MDT
+
+    def _text(self):
+        """The screen as text: attributes, nulls and non-display fields read as blanks."""
+        data = bytearray(self._buffer)
+        for start, positions in self._fields():
+            data[start] = _SPACE
+            if self._attributes[start] & NONDISPLAY == NONDISPLAY:
+                for position in positions:
+                    data[position] = _SPACE
+        return data.replace(b"\0", b"\x40").decode(ENCODING)
+
+    def _read_modified(self, aid):
+        """The inbound record for an AID: the AID, the cursor address and the data of each modified field."""
+        parts = [bytes([aid]), encode_address(self._cursor)]
+        if not self._starts:
+            parts.append(bytes(self._buffer).replace(b"\0", b""))
+        for start, positions in self._fields():
+            if self._attributes[start] & MDT:
+                parts.append(bytes([SBA]) + encode_address((start + 1) % SCREEN_SIZE))
+                parts.append(bytes(self._buffer[p] for p in positions if self._buffer[p]))
+        return b"".join(parts)
+
+    def _read_buffer(self):
+        parts = [bytes([self._aid]), encode_address(self._cursor)]
+        for position in range(SCREEN_SIZE):
+            attribute = self._attributes[position]
+            if attribute is None:
+                parts.append(bytes([self._buffer[position]]))
+            else:
+                parts.append(bytes([SF, attribute]))
+        return b"".join(parts)
@@ -0,0 +1,287 @@
+"""A small TN3270 host on localhost that stands in for the mainframe, for trying tn3270.TN3270Backend and scripts.
+
+Example::
+
+    with StandInHost() as host:
+        bzio.use_backend(TN3270Backend(*host.address))
+        bzio.Connect("")
+        print(bzio.ReadScreen(9, 2, 36))
+
+Run ``python -m bzio.tn3270host [--port N]`` to serve the demo panels until interrupted.
+
+Panels are plain text. Each run of underscores becomes an input field, pre-filled with the underscores as MAXIS
+does. The characters on either side of the run hold its field attributes, so they show as blanks. Values to show
+in input fields are given separately, by the position of the field.
+"""
+
+import argparse
+import collections
+import re
+import socket
+import socketserver
+import threading
+import time
+
+from .emulator import screen_text
+from .screen import COLS, SCREEN_SIZE, screen_offset
+from .tn3270 import (ADDRESS_CODES, AIDS, DO, ENCODING, EOR, IC, PROTECTED, SBA, SF, TTYPE, TTYPE_IS, TTYPE_SEND, WILL,
+                     WONT, BINARY, Telnet, decode_address, encode_address)
+
+PROTECTED_ATTRIBUTE = ADDRESS_CODES[PROTECTED]
+INPUT_ATTRIBUTE = ADDRESS_CODES[0]
+# Erase/Write, with a WCC that resets, unlocks the keyboard and clears every field's modified flag.
+ERASE_WRITE = 0xF5
+WCC = 0xC3
+
+_KEYS = dict((code, key) for key, code in AIDS.items())
+
+Panel = collections.namedtuple("Panel", "rows cursor values")
+Panel.__new__.__defaults__ = (None, None)
+
+
+def input_fields(rows):
+    """Return the (row, col, length) of each input field in a panel."""
+    text = screen_text(rows)
+    return [(start // COLS + 1, start % COLS + 1, length) for start, length in _runs(text)]
+
+
+def _runs(text):
+    for row in range(0, SCREEN_SIZE, COLS):
+        for match in re.finditer("_+", text[row:row + COLS]):
+            yield row + match.start(), match.end() - match.start()
+
+
+def panel_record(rows, cursor=None, values=None):
+    """Build the Erase/Write record that shows a panel.
+
+    cursor is (row, col), by default the first input field. values maps the (row, col) of input fields to the
+    text to show in them.
+    """
+    text = screen_text(rows)
+    runs = list(_runs(text))
+    if values:
+        text = list(text)
+        for (row, col), value in values.items():
+            start = screen_offset(len(value), row, col)
+            text[start:start + len(value)] = value
+        text = "".join(text)
+    attributes = dict(((start + length) % SCREEN_SIZE, PROTECTED_ATTRIBUTE) for start, length in runs)
+    attributes.update(((start - 1) % SCREEN_SIZE, INPUT_ATTRIBUTE) for start, length in runs)
+    if not attributes:
+        attributes[0] = PROTECTED_ATTRIBUTE
+    chars = text.encode(ENCODING, "replace")
+    data = bytearray([ERASE_WRITE, WCC])
+    written = 0
+    for position in sorted(attributes):
+        data += chars[written:position] + bytes([SF, attributes[position]])
+        written = position + 1
+    data += chars[written:]
+    if cursor is not None:
+        position = screen_offset(0, cursor[0], cursor[1])
+    else:
+        position = runs[0][0] if runs else 0
+    data += bytes([SBA]) + encode_address(position) + bytes([IC])
+    return bytes(data)
+
+
+def parse_input(record):
+    """Return (key, cursor, fields) from a terminal's record: the AID key, (row, col), and {(row, col): text}.
+
+    fields holds each modified input field by the position of its first character.
+    """
+    key = _KEYS.get(record[0])
+    if len(record) < 3:
+        return key, None, {}
+    cursor = decode_address(record[1], record[2])
+    fields = {}
+    for part in record[3:].split(bytes([SBA]))[1:]:
+        start = decode_address(part[0], part[1])
+        fields[(start // COLS + 1, start % COLS + 1)] = part[2:].decode(ENCODING)
+    return key, (cursor // COLS + 1, cursor % COLS + 1), fields
+
+
+class _HostTelnet(Telnet):
+    """Negotiates a basic TN3270 session, then runs the application for every AID the terminal sends."""
+
+    def __init__(self, sock, host):
+        super(_HostTelnet, self).__init__(sock)
+        self.host = host
+        self.state = {}
+        self.terminal_type = None
+
+    def start(self):
+        self.send_command(DO, TTYPE)
+
+    def command(self, command, option):
+        if option == TTYPE and command == WILL and self.terminal_type is None:
+            self.send_subnegotiation(bytes([TTYPE, TTYPE_SEND]))
+        elif option == TTYPE and command == WONT:
+            raise ConnectionError("The client is not a 3270 terminal.")
+
+    def subnegotiation(self, payload):
+        if payload[:2] != bytes([TTYPE, TTYPE_IS]) or self.terminal_type is not None:
+            return
+        self.terminal_type = payload[2:].decode("ascii", "replace")
+        for option in (EOR, BINARY):
+            self.send_command(DO, option)
+            self.send_command(WILL, option)
+        self.show(self.host.application(self.state, None, {}))
+
+    def record(self, data):
+        key, cursor, fields = parse_input(data)
+        delay = self.host.latency() if callable(self.host.latency) else self.host.latency
+        if delay:
+            time.sleep(delay)
+        self.show(self.host.application(self.state, key, fields))
+
+    def show(self, panel):
+        if not isinstance(panel, Panel):
+            panel = Panel(panel)
+        self.send_record(panel_record(*panel))
+
+
+class _Handler(socketserver.BaseRequestHandler):
+
+    def handle(self):
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        telnet = _HostTelnet(self.request, self.server.stand_in)
+        self.server.stand_in.connections += 1
+        telnet.start()
+        while True:
+            data = self.request.recv(65536)
+            if not data:
+                return
+            telnet.feed(data)
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    # Room for many terminals connecting at once, as in a load test; the default backlog of 5 drops some.
+    request_queue_size = 128
+
+
+class StandInHost(object):
+    """Serves an application to TN3270 terminals on a background thread.
+
+    application is called as application(state, key, fields), with a dict kept per connection, the AID key
+    (None when the terminal first connects) and the modified fields as parse_input() returns them. It returns the
+    next panel's rows, or a Panel with the cursor position and field values as well. latency is added before
+    each reply, to act like a busy host: seconds, or a callable returning them.
+    """
+
+    def __init__(self, application=None, host="127.0.0.1", port=0, latency=0.0):
+        self.application = application if application is not None else demo_application
+        self.latency = latency
+        self.connections = 0
+        self._server = _Server((host, port), _Handler)
+        self._server.stand_in = self
+        self._thread = None
+
+    @property
+    def address(self):
+        """The (host, port) the host is listening on."""
+        return self._server.server_address[:2]
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="tn3270 stand-in host")
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+# The demo application: a few MAXIS-like panels.
+
+def _panel(title, lines=(), message=""):
+    rows = ["", " " * ((COLS - len(title)) // 2) + title, ""] + list(lines)
+    return rows + [""] * (23 - len(rows)) + [" " + message]
+
+
+def _self(state, message=""):
+    rows = _panel("SELF - Select Function", [""] * 12 + ["            Function: ____", "", "            Case Nbr: ________"], message)
+    return Panel(rows, values={(16, 23): state.get("function", ""), (18, 23): state.get("case_number", "")})
+
+
+def _memb(state, message=""):
+    return _panel("STAT/MEMB", [
+        " Case Nbr: %-8s" % state["case_number"], "",
+        " Memb Nbr: 01       Last: SAMPLE                 First: PAT",
+        " Birth Date: 01 01 80",
+    ], message)
+
+
+def _note_list(state, message=""):
+    notes = state.setdefault("notes", {}).get(state["case_number"], [])
+    lines = [" Case Nbr: %-8s" % state["case_number"], ""]
+    lines += [" %d  %s" % (n, note[0] if note else "") for n, note in enumerate(notes[-15:], 1)]
+    return _panel("CASE/NOTE", lines, message or "PF9 TO ADD A NOTE")
+
+
+def _note_page():
+    return Panel(_panel("CASE/NOTE", ["  " + "_" * 74 for _ in range(14)], "PF8 NEXT PAGE  PF3 SAVE"), (4, 3))
+
+
+def demo_application(state, key, fields):
+    """SELF takes a function (STAT or CASE) and a case number; PF3 goes back; PF9 on CASE/NOTE adds a note."""
+    panel = state.get("panel")
+    if key is None or (key == "<pf3>" and panel in ("STAT/MEMB", "CASE/NOTE")):
+        state["panel"] = "SELF"
+        return _self(state)
+    if panel == "SELF":
+        function = fields.get((16, 23), state.get("function", "")).strip("_ ").upper()
+        case_number = fields.get((18, 23), state.get("case_number", "")).strip("_ ")
+        state.update(function=function, case_number=case_number)
+        if key != "<enter>" or function not in ("STAT", "CASE"):
+            return _self(state, "ENTER A VALID COMMAND OR PF-KEY")
+        if not case_number.isdigit():
+            return _self(state, "CASE NUMBER IS REQUIRED")
+        state["panel"] = "STAT/MEMB" if function == "STAT" else "CASE/NOTE"
+        return _memb(state) if function == "STAT" else _note_list(state)
+    if panel == "CASE/NOTE" and key == "<pf9>":
+        state["panel"], state["draft"] = "NOTE EDIT", []
+        return _note_page()
+    if panel == "NOTE EDIT":
+        state["draft"] += [fields.get((row, 3), "").rstrip("_ ") for row in range(4, 18)]
+        if key == "<pf8>":
+            return _note_page()
+        if key == "<pf3>":
+            lines = state.pop("draft")
+            while lines and not lines[-1]:
+                lines.pop()
+            if lines:
+                state.setdefault("notes", {}).setdefault(state["case_number"], []).append(lines)
+            state["panel"] = "CASE/NOTE"
+            return _note_list(state, "NOTE SAVED" if lines else "NOTE NOT SAVED: NOTHING WAS ENTERED")
+        return _note_page()
+    if panel == "STAT/MEMB":
+        return _memb(state, "ENTER A VALID COMMAND OR PF-KEY")
+    return _note_list(state, "ENTER A VALID COMMAND OR PF-KEY")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m bzio.tn3270host", description="Serve the demo panels over TN3270.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=3270)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds to wait before each reply")
+    options = parser.parse_args(argv)
+    host = StandInHost(host=options.host, port=options.port, latency=options.latency).start()
+    print("Serving on %s:%d; press Ctrl+C to stop." % host.address)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        host.stop()
+
+
+if __name__ == "__main__":
+    main()
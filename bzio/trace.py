@@ -0,0 +1,162 @@
+"""Opt-in instrumentation of every bzio call: counts, wall time, arguments and the script line that made it.
+
+Example::
+
+    from bzio import trace
+
+    with trace.tracing() as tracer:
+        run_my_script()
+    print(tracer.summary())
+    tracer.write_chrome_trace("trace.json")  # open in chrome://tracing or https://ui.perfetto.dev
+
+Tracing works by swapping instrumented methods onto session.Session while it is enabled, so it costs nothing
+at all when it is off.
+"""
+
+import contextlib
+import functools
+import json
+import os
+import sys
+import threading
+import time
+
+from .session import Session
+
+# Session methods that are instrumented; the module-level bzio functions all go through these.
+TRACED = (
+    "Connect", "Focus", "CursorCol", "CursorRow", "GetCursor", "MsgBox", "ReadScreen", "Search", "SendKey", "SetCursor",
+    "Snapshot", "Transmit", "WaitReady", "WriteScreen", "read_text", "search_screen", "wait_for_text", "wait_for_change",
+    "transmit_until",
+)
+
+ARG_REPR_LIMIT = 60
+
+# Frames from files in here are bzio's own, never the caller's.
+_PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__)) + os.sep
+
+# The Tracer in use, or None when tracing is off.
+tracer = None
+_originals = {}
+# Per thread, the traced calls running there, innermost last, each with the time spent in the calls it made so far.
+_active = threading.local()
+
+
+class Tracer(object):
+    """Collects one event per bzio call, including the calls bzio makes itself such as the WaitReady in Transmit.
+
+    Each event has its nesting depth (0 for a call made by the script) and its self time, which leaves out the
+    calls it made. Self times add up to the time spent in bzio; inclusive times count nested calls again.
+    """
+
+    def __init__(self):
+        self.events = []
+        self.totals = {}
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+
+    def record(self, name, started, duration, args, caller, depth=0, self_time=None):
+        """Add one finished call; self_time defaults to the whole duration, for a call that made no others."""
+        if self_time is None:
+            self_time = duration
+        event = (name, started - self._origin, duration, args, caller, threading.get_ident(), depth, self_time)
+        with self._lock:
+            self.events.append(event)
+            count, total, own, longest = self.totals.get(name, (0, 0.0, 0.0, 0.0))
+            self.totals[name] = (count + 1, total + duration, own + self_time, max(longest, duration))
+
+    def summary(self):
+        """Return a table of calls per function with inclusive and self time, most self time first."""
+        lines = ["%-16s %8s %12s %12s %10s %10s" % ("call", "count", "total ms", "self ms", "mean ms", "max ms")]
+        for name, (count, total, own, longest) in sorted(self.totals.items(), key=lambda item: -item[1][2]):
+            lines.append("%-16s %8d %12.1f %12.1f %10.2f %10.2f"
+                         % (name, count, total * 1000, own * 1000, total * 1000 / count, longest * 1000))
+        return "\n".join(lines)
+
+    def chrome_trace(self):
+        """Return the events in Chrome's trace event format."""
+        pid = os.getpid()
+        events = []
+        # Complete ("X") events on one thread nest by their times, so nested calls show under their parent.
+        for name, started, duration, args, caller, tid, depth, self_time in self.events:
+            events.append({
+                "name": name, "cat": "bzio", "ph": "X", "pid": pid, "tid": tid,
+                "ts": started * 1e6, "dur": duration * 1e6,
+                "args": {"args": args, "caller": "%s:%d" % caller if caller else None, "self_ms": self_time * 1000},
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_chrome_trace(self, path):
+        """Write chrome_trace() as JSON."""
+        with open(path, "w") as f:
+            json.dump(self.chrome_trace(), f)
+
+
+def caller():
+    """Return (filename, line) of the nearest frame outside the bzio package, or None."""
+    frame = sys._getframe(1)
+    while frame is not None:
+        if not os.path.abspath(frame.f_code.co_filename).startswith(_PACKAGE_DIR):
+            return frame.f_code.co_filename, frame.f_lineno
+        frame = frame.f_back
+    return None
+
+
+def _instrument(name, method):
+    @functools.wraps(method)
+    def traced(self, *args, **kwargs):
+        current = tracer
+        if current is None:
+            return method(self, *args, **kwargs)
+        where = caller()
+        stack = getattr(_active, "stack", None)
+        if stack is None:
+            stack = _active.stack = []
+        depth = len(stack)
+        # Time spent in the calls this one makes, added to by each of them as it finishes.
+        nested = [0.0]
+        stack.append(nested)
+        started = time.perf_counter()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            duration = time.perf_counter() - started
+            stack.pop()
+            if stack:
+                stack[-1][0] += duration
+            shown = [repr(arg)[:ARG_REPR_LIMIT] for arg in args]
+            shown += ["%s=%s" % (key, repr(value)[:ARG_REPR_LIMIT]) for key, value in sorted(kwargs.items())]
+            shown = ", ".join(shown)
+            current.record(name, started, duration, shown, where, depth, duration - nested[0])
+    return traced
+
+
+def enable(new_tracer=None):
+    """Start tracing every Session (and so every bzio function) and return the Tracer collecting the calls."""
+    global tracer
+    if tracer is None:
+        for name in TRACED:
+            _originals[name] = Session.__dict__[name]
+            setattr(Session, name, _instrument(name, _originals[name]))
+    tracer = new_tracer if new_tracer is not None else Tracer()
+    return tracer
+
+
+def disable():
+    """Stop tracing and put the plain methods back; returns the Tracer that was in use."""
+    global tracer
+    finished, tracer = tracer, None
+    for name, method in _originals.items():
+        setattr(Session, name, method)
+    _originals.clear()
+    return finished
+
+
+@contextlib.contextmanager
+def tracing(new_tracer=None):
+    """Trace the calls made inside a with block."""
+    current = enable(new_tracer)
+    try:
+        yield current
+    finally:
+        disable()
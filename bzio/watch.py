@@ -0,0 +1,120 @@
+"""Follow the host screen as a stream of change events, instead of looping on ReadScreen.
+
+Example::
+
+    watcher = ScreenWatcher(classifier=classifier, rows=range(1, 24))   # ignore the message line
+    for change in watcher.changes():
+        if change.panel == "CASE/NOTE":
+            ...
+
+Each poll is one read of the screen text. An unchanged screen is rejected by a single string comparison; when it
+has changed, a hash per row tells which rows did, and the panel is classified again only if its header rows
+changed. The cursor is read only for a change that is reported. Polls
+start quickly after a change and back off while the screen stays the same, so an idle screen costs a read every
+POLL_MAX seconds.
+"""
+
+import collections
+import time
+
+import bzio
+
+from .screen import COLS, ROWS, SCREEN_SIZE, Screen, screen_offset
+from .session import POLL_BACKOFF, POLL_FIRST, POLL_MAX
+
+ScreenChange = collections.namedtuple("ScreenChange", "screen rows panel fingerprint")
+ScreenChange.__doc__ = """A change seen by ScreenWatcher: the new Screen, the changed row numbers (1-24), and the
+panel name and header fingerprint from the classifier (None without one)."""
+
+
+def row_hashes(text):
+    """Return a hash of each row of a screen's text."""
+    return tuple(hash(text[start:start + COLS]) for start in range(0, SCREEN_SIZE, COLS))
+
+
+def _rows_of(region):
+    """The rows a panels.Region covers."""
+    start = screen_offset(region.length, region.row, region.col)
+    return range(start // COLS + 1, (start + region.length - 1) // COLS + 2)
+
+
+class ScreenWatcher(object):
+    """Polls a session (the module-level bzio session by default) and reports what changed on its screen.
+
+    classifier is an optional panels.PanelClassifier naming the panel of each change. rows limits the rows
+    watched, e.g. to leave out a clock or message line; changes elsewhere are taken in without an event.
+    The first poll only records the screen to compare against. screen is the Screen of the last change reported.
+    """
+
+    def __init__(self, session=None, classifier=None, rows=None, interval=POLL_FIRST, max_interval=POLL_MAX,
+                 backoff=POLL_BACKOFF):
+        self.session = session if session is not None else bzio
+        self.classifier = classifier
+        self.rows = frozenset(rows) if rows is not None else None
+        self.first_interval = interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        # Seconds until the next poll; reset after each change and grown while nothing changes.
+        self.interval = interval
+        self.screen = None
+        self.panel = None
+        self.fingerprint = None
+        self.polls = 0
+        self._text = None
+        self._hashes = None
+        self._header_rows = frozenset()
+        if classifier is not None:
+            self._header_rows = frozenset(row for region in classifier.header for row in _rows_of(region))
+
+    def poll(self):
+        """Read the screen once; return a ScreenChange if watched rows changed since the last poll, else None."""
+        text = self.session.read_text()
+        self.polls += 1
+        if text == self._text:
+            return None
+        hashes = row_hashes(text)
+        first = self._text is None
+        if first:
+            changed = range(1, ROWS + 1)
+        else:
+            changed = [row for row, (old, new) in enumerate(zip(self._hashes, hashes), 1) if old != new]
+        self._text, self._hashes = text, hashes
+        if self.classifier is not None and (first or self._header_rows.intersection(changed)):
+            found = self.classifier.classify(text)
+            self.panel, self.fingerprint = found.panel, found.fingerprint
+        if self.rows is not None:
+            changed = [row for row in changed if row in self.rows]
+        if first or not changed:
+            return None
+        self.interval = self.first_interval
+        self.screen = Screen(text, self.session.GetCursor())
+        return ScreenChange(self.screen, tuple(changed), self.panel, self.fingerprint)
+
+    def next_delay(self):
+        """Return how long to sleep before the next poll, and back off for the one after."""
+        delay = self.interval
+        self.interval = min(self.interval * self.backoff, self.max_interval)
+        return delay
+
+    def wait(self, timeout=30.0):
+        """Poll until the next change and return it; raises TimeoutError after timeout seconds (None waits forever)."""
+        deadline = time.perf_counter() + timeout if timeout is not None else None
+        while True:
+            change = self.poll()
+            if change is not None:
+                return change
+            delay = self.next_delay()
+            if deadline is not None:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    raise TimeoutError("Gave up after %.1f seconds waiting for the screen to change." % timeout)
+                delay = min(delay, remaining)
+            time.sleep(delay)
+
+    def changes(self, timeout=None):
+        """Yield ScreenChange events as they happen; stop once none comes for timeout seconds (None never stops)."""
+        while True:
+            try:
+                yield self.wait(timeout)
+            except TimeoutError:
+                return
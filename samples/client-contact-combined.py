@@ -1,8 +1,19 @@
 # client-contact
 import datetime
+import os
+import sys
 
 import wx
 import wx.xrc
+
+# bzio is not installed; it lives at the top of this repository, so put that on the path as benchmarks/ does.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import bzio  # noqa: E402
+from bzio.casenote import CaseNote, NoteWriter  # noqa: E402
+from bzio.navigation import NavigationError  # noqa: E402
+from bzio.prefetch import Prefetch  # noqa: E402
+from bzio.schema import Field, Schema  # noqa: E402
 # ADD widget classes here
 
 
@@ -199,6 +210,30 @@ class MAXISClientContact ( wx.Frame ):
 	def __del__( self ):
 		pass
 
+	def fill_case_data( self, prefetch ):
+		# Called on the GUI thread once the background reads are done. Anything the worker already typed is kept.
+		if not self:
+			return
+		try:
+			case_data = prefetch.result()
+		except Exception as e:
+			print("Could not read the case: %s" % (e))
+			return
+		if case_data["case_number"] != self.editbox_MAXIS_case_number.GetValue().strip():
+			return
+		if self.editbox_case_status.IsEmpty() and case_data["case_status"]:
+			self.editbox_case_status.SetValue(case_data["case_status"])
+		if case_data["phone_numbers"]:
+			typed = self.combo_phone_number.GetValue()
+			self.combo_phone_number.Set(case_data["phone_numbers"])
+			self.combo_phone_number.SetValue(typed or case_data["phone_numbers"][0])
+		if self.editbox_mets_ic_number.IsEmpty() and case_data["mets_ic_number"]:
+			self.editbox_mets_ic_number.SetValue(case_data["mets_ic_number"])
+		if case_data["arep_name"]:
+			found = self.combo_contact_person.FindString(u"AREP")
+			if found != wx.NOT_FOUND:
+				self.combo_contact_person.SetString(found, u"AREP (%s)" % (case_data["arep_name"]))
+
 	# Virtual event handlers, overide them in your derived class
 	def cancel_confirmation( self, event ):
 		# event.Skip()
@@ -537,19 +572,84 @@ worker_type = "MAXIS"
 # Find Case number
 
 def write_bullet_and_variable(bullet, option):
-	if len(option) > 0:
-		print("* %s: %s" % (bullet, option))
+	note.bullet(bullet, option)
+
+# Where the case details the dialog asks for are on the MAXIS panels. Case numbers are (length, row, col).
+CASE_NUMBER_ON_PANEL = (8, 20, 38)
+CASE_NUMBER_ON_SELF = (8, 18, 43)
+CASE_CURR = Schema("CASE/CURR", case_status=Field(8, 9, 8))
+STAT_ADDR = Schema("STAT/ADDR", phone_1=Field(17, 45, 18, blank=""), phone_2=Field(18, 45, 18, blank=""),
+                   phone_3=Field(19, 45, 18, blank=""))
+STAT_AREP = Schema("STAT/AREP", arep_name=Field(4, 32, 37, strip=" _"))
+STAT_MEMB = Schema("STAT/MEMB", mets_ic_number=Field(16, 40, 10, strip=" _"))
+
+def read_case_number(session):
+	# Case panels show the case number on row 20; SELF has it in its case number field.
+	screen = session.Snapshot()
+	for position in (CASE_NUMBER_ON_PANEL, CASE_NUMBER_ON_SELF):
+		case_number = screen.read(*position).strip(" _")
+		if case_number.isdigit():
+			return case_number
+	return ""
+
+def maxis_navigate(session, panel, case_number):
+	# Back out to SELF, open function/command (e.g. "STAT/ADDR") for the case with one transmit, and return a
+	# snapshot of the panel. Raises NavigationError rather than handing back some other screen.
+	presses = 0
+	while session.ReadScreen(4, 2, 50) != "SELF":
+		if presses == 10:
+			raise NavigationError("Could not get back to SELF to open %s." % (panel))
+		session.SendKey("<pf3>")
+		session.WaitReady(0, 0)
+		presses += 1
+	function, command = panel.split("/")
+	with session.write_batch(verify=False) as batch:
+		batch.write(function, 16, 43)
+		batch.write(str(case_number).ljust(8, "_"), 18, 43)
+		batch.write(command, 21, 70)
+	screen = session.Snapshot()
+	if command not in "".join(screen.rows(1, 3)):
+		raise NavigationError("Expected %s but reached: %s" % (panel, screen.row(24).strip() or screen.row(2).strip()))
+	return screen
+
+def phone_text(text):
+	digits = "".join(c for c in text if c.isdigit())
+	return "%s-%s-%s" % (digits[:3], digits[3:6], digits[6:]) if len(digits) == 10 else ""
+
+def read_case_data(session, case_number):
+	# Runs on its own session while the dialog is open, and leaves the screen on CASE/NOTE for the note.
+	case_data = {"case_number": case_number}
+	case_data.update(CASE_CURR.parse(maxis_navigate(session, CASE_CURR.panel, case_number))._asdict())
+	addr = STAT_ADDR.parse(maxis_navigate(session, STAT_ADDR.panel, case_number))
+	case_data["phone_numbers"] = [phone for phone in map(phone_text, addr) if phone]
+	case_data.update(STAT_AREP.parse(maxis_navigate(session, STAT_AREP.panel, case_number))._asdict())
+	case_data.update(STAT_MEMB.parse(maxis_navigate(session, STAT_MEMB.panel, case_number))._asdict())
+	maxis_navigate(session, "CASE/NOTE", case_number)
+	return case_data
 
 now = datetime.datetime.now()
 
 now_time = now.strftime("%m-%d-%Y %H:%M")
 
-MAXIS_case_number = str(123423)
+MAXIS_case_number = ""
+prefetch = None
+if worker_type == "MAXIS":
+	# The host sits idle while the worker fills in the dialog, so read the case in the background meanwhile.
+	# Without a host the dialog still opens, just without a case number or prefetch.
+	try:
+		bzio.Connect("")
+		MAXIS_case_number = read_case_number(bzio)
+	except Exception as e:
+		print("Could not read the case number from the screen: %s" % (e))
+	if MAXIS_case_number:
+		prefetch = Prefetch(read_case_data, MAXIS_case_number)
 
 app = wx.App()
 
 if worker_type == "MAXIS":
     frame = MAXISClientContact(None)
+    if prefetch is not None:
+        prefetch.add_done_callback(lambda done: wx.CallAfter(frame.fill_case_data, done))
 if worker_type == "PRISM":
     frame = PRISMClientContact(None)
 frame.Show()
@@ -562,13 +662,13 @@ if worker_type is "MAXIS":
 	print("Case number: %s" % (MAXIS_case_number))
 	print(" ")
 	if contact_re is wx.EmptyString:
-		print("%s %s %s" % (contact_type, contact_dir, contact_person))
+		note = CaseNote("%s %s %s" % (contact_type, contact_dir, contact_person))
 	else:
-		print("%s %s %s Re: %s" % (contact_type, contact_dir, contact_person, contact_re))
+		note = CaseNote("%s %s %s Re: %s" % (contact_type, contact_dir, contact_person, contact_re))
 	if interpreter_checkbox:
-		print("* Contact was made: %s w/ interperter" % (contact_time))
+		note.item("Contact was made: %s w/ interperter" % (contact_time))
 	else:
-		print("* Contact was made: %s" % (contact_time))
+		note.item("Contact was made: %s" % (contact_time))
 
 	write_bullet_and_variable("Phone Number", phone_number)
 	write_bullet_and_variable("MNSURE/IC number", mets_ic_number)
@@ -579,18 +679,31 @@ if worker_type is "MAXIS":
 	write_bullet_and_variable("Case status", case_status)
 
 	if caf_1_checkbox:
-		print("* Reminded client about the importance of submitting the CAF 1.")
+		note.item("Reminded client about the importance of submitting the CAF 1.")
 	if sent_arep_checkbox:
-		print("*Sent forms(s) to AREP.")
+		note.item("Sent forms(s) to AREP.")
 	if call_center_answer_checkbox:
-		print("* Call center answered caller's question.")
+		note.item("Call center answered caller's question.")
 	if call_center_transfer_checkbox:
-		print("* Call center transferred call to a worker.")
+		note.item("Call center transferred call to a worker.")
 	if follow_up_checkbox:
-		print("* Follow-up is needed.")
-
-	print("---")
-	print(worker_singature)
+		note.item("Follow-up is needed.")
+
+	note.line("---")
+	note.line(worker_singature)
+
+	# The background reads left the screen on CASE/NOTE for the case; go there now only if they did not.
+	try:
+		case_data = prefetch.result() if prefetch is not None else None
+	except Exception:
+		case_data = None
+	if case_data is None or case_data["case_number"] != str(MAXIS_case_number):
+		bzio.Connect("")
+		maxis_navigate(bzio, "CASE/NOTE", MAXIS_case_number)
+
+	# The whole note is laid out before anything is sent, then entered a page at a time.
+	print(note)
+	NoteWriter().write(note)
 
 if worker_type is "PRISM":
 	print("PRISM")
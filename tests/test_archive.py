@@ -0,0 +1,75 @@
+"""ScreenArchive records, side index and memory map."""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from bzio.archive import SLOT_SIZE, ScreenArchive
+from bzio.screen import SCREEN_SIZE, Screen
+
+
+def screen(title):
+    return Screen(title.ljust(SCREEN_SIZE), (4, 5))
+
+
+class ArchiveTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "screens.bza")
+        self.archive = ScreenArchive(self.path)
+
+    def tearDown(self):
+        self.archive.close()
+        shutil.rmtree(self.directory)
+
+    def test_append_and_read(self):
+        number = self.archive.append(screen("SELF"), case_number="123", panel="SELF", timestamp=10.0)
+        record = self.archive.record(number)
+        self.assertEqual((record.case_number, record.panel, record.timestamp), ("123", "SELF", 10.0))
+        self.assertEqual(record.screen.cursor, (4, 5))
+        self.assertEqual(record.screen.read(4, 1, 1), "SELF")
+
+    def test_find(self):
+        self.archive.append(screen("A"), case_number="100", panel="STAT/JOBS", timestamp=1.0)
+        self.archive.append(screen("B"), case_number="200", panel="STAT/MEMB", timestamp=2.0)
+        self.archive.append(screen("C"), case_number="300", panel="STAT/JOBS", timestamp=3.0)
+        self.assertEqual(self.archive.find(panel="STAT/JOBS"), [0, 2])
+        self.assertEqual(self.archive.find(case_from="150", case_to="300"), [1, 2])
+        self.assertEqual(self.archive.find(since=2.0, panel="STAT/JOBS"), [2])
+
+    def test_append_while_a_raw_view_is_held(self):
+        self.archive.append(screen("FIRST"))
+        view = self.archive.raw(0)
+        self.archive.append(screen("SECOND"))
+        self.assertEqual(self.archive.record(1).screen.read(6, 1, 1), "SECOND")
+        self.assertEqual(bytes(view[:5]), b"FIRST")
+        view.release()
+
+    def test_close_while_a_raw_view_is_held(self):
+        self.archive.append(screen("FIRST"))
+        view = self.archive.raw(0)
+        self.archive.close()
+        self.assertEqual(bytes(view[:5]), b"FIRST")
+        view.release()
+        self.archive = ScreenArchive(self.path)
+
+    def test_long_panel_name_is_refused(self):
+        with self.assertRaises(ValueError):
+            self.archive.append(screen("X"), panel="STAT/VERYLONGPANELNAME")
+        with self.assertRaises(ValueError):
+            self.archive.append(screen("X"), case_number="1" * (SLOT_SIZE + 1))
+        self.assertEqual(len(self.archive), 0)
+        self.assertEqual(os.path.getsize(self.path), 0)
+
+    def test_reopen_rebuilds_missing_index(self):
+        self.archive.append(screen("A"), case_number="100", panel="STAT/JOBS")
+        self.archive.close()
+        os.remove(self.path + ".idx")
+        self.archive = ScreenArchive(self.path)
+        self.assertEqual(self.archive.find(panel="STAT/JOBS", case_from="100", case_to="100"), [0])
+
+
+if __name__ == "__main__":
+    unittest.main()
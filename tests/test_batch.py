@@ -0,0 +1,78 @@
+"""WriteBatch writes, keys and verification."""
+
+import unittest
+
+from bzio.batch import WriteError
+from bzio.emulator import Emulator
+from bzio.session import Session
+
+PANEL = ["STAT/MEMB", "", " Name: ________"]
+
+
+class VerifyTest(unittest.TestCase):
+
+    def setUp(self):
+        self.emulator = Emulator(PANEL)
+        self.session = Session(backend=self.emulator)
+
+    def commit(self, verify=True):
+        with self.session.write_batch(verify=verify) as batch:
+            batch.write("SMITH", 3, 8)
+
+    def test_kept_field(self):
+        self.emulator.on_key("<enter>", lambda emulator, key: None)
+        self.commit()
+        self.assertEqual(self.emulator.calls["send_key"], 1)
+
+    def test_answer_on_another_panel(self):
+        self.emulator.on_key("<enter>", ["STAT/ADDR", "", " Street: ____________"])
+        self.commit()
+        self.assertEqual(self.session.ReadScreen(9, 1, 1), "STAT/ADDR")
+
+    def test_field_blanked_on_the_same_panel(self):
+        self.emulator.on_key("<enter>", PANEL + [""] * 20 + ["NAME IS NOT VALID"])
+        with self.assertRaises(WriteError) as caught:
+            self.commit(verify="answer")
+        self.assertEqual(caught.exception.rejected[0][1], "_____")
+
+    def test_blanked_field_is_not_read_back_by_default(self):
+        self.emulator.on_key("<enter>", PANEL + [""] * 20 + ["NAME IS NOT VALID"])
+        self.commit()
+        self.assertEqual(self.emulator.calls["read_screen"], 1)
+
+    def test_refused_write_is_caught_before_the_key(self):
+        self.emulator.write_screen = lambda text, row, col: None
+        with self.assertRaises(WriteError):
+            self.commit()
+        self.assertEqual(self.emulator.calls["send_key"], 0)
+
+
+class HostCallTest(unittest.TestCase):
+    """A verified batch still costs fewer host calls than writing each field and transmitting."""
+
+    def host_calls(self, fields, batched):
+        emulator = Emulator(["DATES"])
+        session = Session(backend=emulator)
+        if batched:
+            with session.write_batch() as batch:
+                for text, row, col in fields:
+                    batch.write(text, row, col)
+        else:
+            for text, row, col in fields:
+                session.WriteScreen(text, row, col)
+            session.Transmit()
+        self.assertEqual(emulator.calls["get_cursor"], 0)
+        return sum(emulator.calls.values())
+
+    def test_adjacent_fields(self):
+        # Five dates, each written as month, day and year next to each other.
+        fields = [(part, 4 + n, 20 + 2 * i) for n in range(5) for i, part in enumerate(("01", "15", "24"))]
+        self.assertLess(self.host_calls(fields, True), self.host_calls(fields, False))
+
+    def test_separate_fields_cost_one_read_to_verify(self):
+        fields = [("X%d" % n, 4 + n, 20) for n in range(15)]
+        self.assertEqual(self.host_calls(fields, True), self.host_calls(fields, False) + 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+"""Importing bzio stays cheap and never touches BlueZone."""
+
+import os
+import re
+import subprocess
+import sys
+import unittest
+
+# Cumulative import time allowed for bzio, in microseconds. It is measured at about 3.5 ms, and pulling in
+# asyncio alone would add about 30 ms.
+IMPORT_BUDGET_US = 20000
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Records every attempt to import the COM modules, whether or not pywin32 is installed.
+_WATCH_COM_IMPORTS = """
+import sys
+attempts = []
+
+class Watch(object):
+    def find_spec(self, name, path=None, target=None):
+        if name.split(".")[0] in ("win32com", "pythoncom", "pywintypes", "win32api"):
+            attempts.append(name)
+        return None
+
+sys.meta_path.insert(0, Watch())
+import bzio
+print(",".join(attempts))
+"""
+
+
+def _python(*args):
+    return subprocess.run([sys.executable] + list(args), cwd=ROOT, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                          universal_newlines=True, check=True)
+
+
+class ImportTest(unittest.TestCase):
+
+    def test_import_time_budget(self):
+        # Best of three, so one slow start on a busy machine does not fail the test.
+        times = []
+        for _ in range(3):
+            stderr = _python("-X", "importtime", "-c", "import bzio").stderr
+            found = re.search(r"^import time:\s+\d+ \|\s+(\d+) \| bzio$", stderr, re.MULTILINE)
+            self.assertIsNotNone(found, stderr)
+            times.append(int(found.group(1)))
+        self.assertLess(min(times), IMPORT_BUDGET_US)
+
+    def test_import_does_not_load_com(self):
+        self.assertEqual(_python("-c", _WATCH_COM_IMPORTS).stdout.strip(), "")
+
+    def test_prefetch_does_not_load_asyncio(self):
+        loaded = _python("-c", "import sys, bzio.prefetch; print('asyncio' in sys.modules)").stdout.strip()
+        self.assertEqual(loaded, "False")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+"""Load-test levels measured against a StandInHost."""
+
+import unittest
+
+from bzio.loadtest import run_level
+from bzio.tn3270host import StandInHost
+
+
+class RunLevelTest(unittest.TestCase):
+
+    def setUp(self):
+        self.host = StandInHost().start()
+
+    def tearDown(self):
+        self.host.stop()
+
+    def test_failed_iterations_move_on(self):
+        seen = []
+
+        def scenario(session, iteration):
+            seen.append(iteration)
+            session.Transmit()
+            if iteration % 2:
+                raise ValueError("odd iteration")
+
+        level = run_level(self.host.address, 1, scenario, 0.3)
+        self.assertEqual(seen, list(range(len(seen))))
+        self.assertEqual(level["iterations"], (len(seen) + 1) // 2)
+        self.assertEqual(level["errors"], len(seen) // 2)
+        self.assertEqual(level["dropped_sessions"], 0)
+
+    def test_throughput_is_over_the_whole_window(self):
+        def scenario(session, iteration):
+            session.Transmit()
+            if iteration == 3:
+                self.host.stop()
+                raise ConnectionError("host went away")
+
+        level = run_level(self.host.address, 1, scenario, 1.0)
+        self.assertEqual(level["iterations"], 3)
+        self.assertEqual(level["dropped_sessions"], 1)
+        self.assertGreaterEqual(level["seconds"], 1.0)
+        self.assertLessEqual(level["throughput"], 3.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+"""Navigator driven against the StandInHost demo panels."""
+
+import unittest
+
+from bzio.navigation import NavigationError, Navigator
+from bzio.panels import PanelClassifier, Region
+from bzio.session import Session
+from bzio.tn3270 import TN3270Backend
+from bzio.tn3270host import StandInHost
+
+
+class NavigatorTest(unittest.TestCase):
+
+    def setUp(self):
+        self.host = StandInHost().start()
+        self.backend = TN3270Backend(*self.host.address, timeout=5.0)
+        self.session = Session(backend=self.backend)
+        self.session.Connect("")
+        classifier = PanelClassifier()
+        classifier.register("SELF", self.session.Snapshot())
+        self.session.WriteScreen("STAT", 16, 23)
+        self.session.WriteScreen("1", 18, 23)
+        self.session.Transmit()
+        classifier.register("STAT/MEMB", self.session.Snapshot())
+        self.session.SendKey("<pf3>")
+        self.session.WaitReady(0, 0)
+        self.nav = Navigator(classifier, case_number_at=Region(4, 12, 8), session=self.session)
+        self.nav.add_route("SELF", "STAT/MEMB", writes=[("STAT", 16, 23), ("{case_number}", 18, 23)])
+        self.nav.add_route("STAT/MEMB", "SELF", key="<pf3>")
+
+    def tearDown(self):
+        self.backend.close()
+        self.host.stop()
+
+    def test_go(self):
+        self.assertEqual(self.nav.go("STAT/MEMB", case_number="12345678"), 1)
+        self.assertEqual(self.session.ReadScreen(8, 4, 12), "12345678")
+        self.assertEqual(self.nav.go("STAT/MEMB", case_number="12345678"), 0)
+
+    def test_shorter_case_number_replaces_longer_one(self):
+        self.nav.go("STAT/MEMB", case_number="12345678")
+        self.assertEqual(self.nav.go("STAT/MEMB", case_number="55"), 2)
+        self.assertEqual(self.session.ReadScreen(8, 4, 12), "55      ")
+        self.assertEqual(self.nav.go("STAT/MEMB", case_number="55"), 0)
+
+    def test_wrong_case_on_arrival(self):
+        self.nav.routes["SELF"][0] = self.nav.routes["SELF"][0]._replace(writes=(("STAT", 16, 23), ("{case_number}9", 18, 23)))
+        with self.assertRaises(NavigationError):
+            self.nav.go("STAT/MEMB", case_number="12")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+"""SessionPool workers driving emulated screens."""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from bzio.emulator import Emulator
+from bzio.pool import SessionPool
+
+
+def emulator(screen):
+    return Emulator(["SCREEN %s" % screen])
+
+
+def read_screen_name(session, case_number):
+    if case_number == "bad":
+        raise ValueError("bad case")
+    if case_number == "crash":
+        os._exit(3)
+    return session.ReadScreen(8, 1, 1)
+
+
+class SessionPoolTest(unittest.TestCase):
+
+    def test_every_case_runs_on_a_session(self):
+        pool = SessionPool(["A", "B", "C"], read_screen_name, emulator)
+        results = list(pool.run(str(n) for n in range(20)))
+        self.assertEqual(sorted(result.case_number for result in results), sorted(str(n) for n in range(20)))
+        for result in results:
+            self.assertEqual(result.value, "SCREEN %s" % result.screen)
+        self.assertEqual((pool.done, pool.failed), (20, 0))
+
+    def test_fewer_cases_than_screens(self):
+        pool = SessionPool(["A", "B", "C"], read_screen_name, emulator)
+        self.assertEqual([result.case_number for result in pool.run(["1"])], ["1"])
+
+    def test_failed_case(self):
+        pool = SessionPool(["A"], read_screen_name, emulator)
+        results = dict((result.case_number, result) for result in pool.run(["1", "bad", "2"]))
+        self.assertEqual(results["bad"].error, "ValueError: bad case")
+        self.assertEqual(results["2"].value, "SCREEN A")
+
+    def test_worker_that_dies(self):
+        pool = SessionPool(["A", "B"], read_screen_name, emulator)
+        results = dict((result.case_number, result) for result in pool.run(["crash"] + [str(n) for n in range(10)]))
+        self.assertEqual(len(results), 11)
+        self.assertIn("exit code 3", results["crash"].error)
+        self.assertEqual(pool.done, 10)
+
+    def test_every_worker_dies(self):
+        pool = SessionPool(["A"], read_screen_name, emulator)
+        with self.assertRaises(RuntimeError):
+            list(pool.run(["crash", "1"]))
+
+    def test_checkpoint(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, "cases.checkpoint")
+        list(SessionPool(["A"], read_screen_name, emulator, path).run(["1", "2"]))
+        pool = SessionPool(["A", "B"], read_screen_name, emulator, path)
+        self.assertEqual([result.case_number for result in pool.run(["1", "2", "3"])], ["3"])
+
+
+if __name__ == "__main__":
+    unittest.main()
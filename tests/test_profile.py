@@ -0,0 +1,61 @@
+"""Per-line host call profiling."""
+
+import contextlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+from bzio import profile
+from bzio.emulator import Emulator
+from bzio.session import Session
+
+
+class ProfilerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.profiler = profile.Profiler()
+        self.profiler.start()
+        self.addCleanup(self.profiler.stop)
+        self.session = Session(backend=Emulator(["SELF"]))
+
+    def test_repeated_read(self):
+        self.session.ReadScreen(4, 1, 1)
+        self.session.ReadScreen(4, 1, 1)
+        self.assertEqual(sum(self.profiler.repeated.values()), 1)
+
+    def test_failed_read_is_not_a_repeat(self):
+        for _ in range(3):
+            with self.assertRaises(ValueError):
+                self.session.ReadScreen(5, 25, 1)
+        self.assertEqual(sum(self.profiler.calls.values()), 3)
+        self.assertEqual(sum(self.profiler.repeated.values()), 0)
+
+
+class MainTest(unittest.TestCase):
+
+    def test_script_imports_modules_next_to_it(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        with open(os.path.join(directory, "profiled_helper.py"), "w") as f:
+            f.write("VALUE = 42\n")
+        script = os.path.join(directory, "script.py")
+        with open(script, "w") as f:
+            f.write("import profiled_helper\nprint(profiled_helper.VALUE)\n")
+        saved_path, saved_argv = sys.path[:], sys.argv[:]
+
+        def restore():
+            sys.path[:], sys.argv[:] = saved_path, saved_argv
+            sys.modules.pop("profiled_helper", None)
+        self.addCleanup(restore)
+        out, err = io.StringIO(), io.StringIO()
+        with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+            profile.main([script])
+        self.assertEqual(out.getvalue(), "42\n")
+        self.assertIn("0 host calls", err.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
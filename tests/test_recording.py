@@ -0,0 +1,71 @@
+"""Recording a session and replaying it without a host."""
+
+import os
+import shutil
+import struct
+import tempfile
+import unittest
+
+from bzio.emulator import Emulator
+from bzio.recording import INPUT, SCREEN, Replay, ReplayError, read_log, start_recording
+from bzio.session import Session
+
+LONG_MESSAGE = "x" * 70000
+
+
+def script(session):
+    """Return what a small script saw: it fills in a panel, transmits and shows a long message."""
+    seen = [session.ReadScreen(4, 1, 1)]
+    session.WriteScreen("STAT", 3, 8)
+    session.Transmit()
+    screen = session.Snapshot()
+    seen += [screen.text, screen.cursor]
+    session.MsgBox(LONG_MESSAGE)
+    return seen
+
+
+class RecordingTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.path = os.path.join(self.directory, "session.bzrec")
+
+    def record(self):
+        emulator = Emulator(["SELF", "", " Cmd: ____"])
+        emulator.on_key("<enter>", lambda emulator, key: emulator.load(["STAT/MEMB", "", " Case: 1234"], cursor=(3, 8)))
+        session = Session(backend=emulator)
+        recorder = start_recording(self.path, session)
+        seen = script(session)
+        recorder.close()
+        return seen
+
+    def test_round_trip(self):
+        recorded = self.record()
+        replay = Replay(self.path)
+        self.assertEqual(script(Session(backend=replay)), recorded)
+        self.assertTrue(replay.finished)
+
+    def test_long_input_is_logged(self):
+        self.record()
+        inputs = [value for kind, seconds, value in read_log(self.path) if kind == INPUT]
+        self.assertEqual(inputs[-1], ["msg_box", LONG_MESSAGE])
+
+    def test_different_input_is_refused(self):
+        self.record()
+        session = Session(backend=Replay(self.path))
+        session.ReadScreen(4, 1, 1)
+        with self.assertRaises(ReplayError):
+            session.WriteScreen("JOBS", 3, 8)
+
+    def test_version_1_log(self):
+        with open(self.path, "wb") as f:
+            f.write(b"BZRC\x01")
+            payload = struct.pack("<HH", 0, 4) + b"SELF"
+            f.write(struct.pack("<BdH", SCREEN, 0.5, len(payload)) + payload)
+        [(kind, seconds, screen)] = list(read_log(self.path))
+        self.assertEqual((kind, seconds, screen[:4]), (SCREEN, 0.5, "SELF"))
+
+
+if __name__ == "__main__":
+    unittest.main()
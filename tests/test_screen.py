@@ -0,0 +1,48 @@
+"""Snapshots and the calls_avoided() counter."""
+
+import unittest
+
+import bzio
+from bzio.emulator import Emulator
+from bzio.schema import Schema
+from bzio.session import Session
+from bzio.watch import ScreenWatcher
+
+
+class CallsAvoidedTest(unittest.TestCase):
+
+    def setUp(self):
+        self.emulator = Emulator(["SELF", "", " Name: SMITH    Age: 42"])
+        self.session = Session(backend=self.emulator)
+        self.before = bzio.calls_avoided()
+
+    def avoided(self):
+        return bzio.calls_avoided() - self.before
+
+    def test_reads_from_a_snapshot(self):
+        screen = self.session.Snapshot()
+        for _ in range(5):
+            screen.read(5, 3, 8)
+        self.assertEqual(self.avoided(), 3)
+
+    def test_schema_fields_count_as_reads(self):
+        Schema("SELF", name=(3, 8, 8), age=(3, 22, 2)).read(self.session)
+        self.assertEqual(self.avoided(), 0)
+        Schema("SELF", a=(3, 8, 1), b=(3, 9, 1), c=(3, 10, 1)).read(self.session)
+        self.assertEqual(self.avoided(), 1)
+
+    def test_bzio_own_snapshots_are_not_counted(self):
+        watcher = ScreenWatcher(self.session)
+        for _ in range(10):
+            watcher.poll()
+        with self.session.caching():
+            self.session.ReadScreen(5, 3, 8)
+            self.session.ReadScreen(2, 3, 22)
+        with self.session.write_batch(key=None) as batch:
+            batch.write("JONES", 3, 8)
+        repr(self.session.Snapshot())
+        self.assertEqual(self.avoided(), -2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+"""Session waits driven against a StandInHost."""
+
+import unittest
+
+from bzio.emulator import Emulator
+from bzio.session import Session
+from bzio.tn3270 import TN3270Backend
+from bzio.tn3270host import StandInHost
+
+
+class TransmitUntilTest(unittest.TestCase):
+
+    def setUp(self):
+        self.host = StandInHost(latency=0.3).start()
+        self.backend = TN3270Backend(*self.host.address, timeout=5.0)
+        self.session = Session(backend=self.backend)
+        self.session.Connect("")
+
+    def tearDown(self):
+        self.backend.close()
+        self.host.stop()
+
+    def test_waits_for_the_new_screen(self):
+        self.session.WriteScreen("STAT", 16, 23)
+        self.session.WriteScreen("1", 18, 23)
+        self.session.transmit_until("STAT/MEMB", 2)
+        self.assertEqual(self.session.ReadScreen(9, 2, 36), "STAT/MEMB")
+
+    def test_text_already_on_screen_waits_for_the_answer(self):
+        self.session.WriteScreen("XXXX", 16, 23)
+        waited = self.session.transmit_until("SELF", 2)
+        self.assertGreaterEqual(waited, 0.3)
+        self.assertEqual(self.session.ReadScreen(31, 24, 2), "ENTER A VALID COMMAND OR PF-KEY")
+
+    def test_timeout(self):
+        self.session.WriteScreen("XXXX", 16, 23)
+        with self.assertRaises(TimeoutError):
+            self.session.transmit_until("NEVER", timeout=0.5)
+
+
+class SendAheadTest(unittest.TestCase):
+
+    def setUp(self):
+        self.emulator = Emulator(["SELF"])
+        self.emulator.on_key("<enter>", ["STAT"])
+        self.session = Session(backend=self.emulator)
+
+    def test_result(self):
+        pending = self.session.send_ahead()
+        self.assertFalse(pending.done())
+        self.assertEqual(pending.result().read(4, 1, 1), "STAT")
+        self.assertTrue(pending.done())
+        self.assertEqual(self.emulator.calls["wait_ready"], 1)
+
+    def test_other_call_only_waits(self):
+        pending = self.session.send_ahead()
+        self.assertEqual(self.session.ReadScreen(4, 1, 1), "STAT")
+        self.assertTrue(pending.done())
+        self.assertEqual(self.emulator.calls["wait_ready"], 1)
+        self.assertEqual(self.emulator.calls["get_cursor"], 0)
+        self.assertEqual(self.emulator.calls["read_screen"], 1)
+
+    def test_result_after_other_calls(self):
+        pending = self.session.send_ahead()
+        self.session.WriteScreen("X", 2, 1)
+        self.assertEqual(pending.result().read(1, 2, 1), "X")
+        self.assertEqual(self.emulator.calls["wait_ready"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+"""TN3270Backend driven against a StandInHost on localhost."""
+
+import unittest
+
+from bzio.casenote import CaseNote, NoteWriter
+from bzio.session import Session
+from bzio.tn3270 import TN3270Backend
+from bzio.tn3270host import Panel, StandInHost
+
+
+class StandInHostTest(unittest.TestCase):
+
+    application = None
+
+    def setUp(self):
+        self.host = StandInHost(self.application).start()
+        self.backend = TN3270Backend(*self.host.address, timeout=5.0)
+        self.session = Session(backend=self.backend)
+        self.session.Connect("")
+
+    def tearDown(self):
+        self.backend.close()
+        self.host.stop()
+
+
+class ConnectTest(StandInHostTest):
+
+    def test_connect_shows_first_panel(self):
+        self.assertEqual(self.session.ReadScreen(22, 2, 30), "SELF - Select Function")
+        self.assertEqual(self.session.GetCursor(), (16, 23))
+
+    def test_reconnect(self):
+        self.session.Connect("")
+        self.session.Connect("")
+        self.assertEqual(self.host.connections, 3)
+        self.assertEqual(self.session.ReadScreen(4, 2, 30), "SELF")
+        self.session.WriteScreen("STAT", 16, 23)
+        self.session.WriteScreen("123", 18, 23)
+        self.session.Transmit()
+        self.assertEqual(self.session.ReadScreen(9, 2, 36), "STAT/MEMB")
+
+    def test_close_and_connect(self):
+        self.backend.close()
+        self.session.Connect("")
+        self.assertEqual(self.session.ReadScreen(4, 2, 30), "SELF")
+
+
+class FieldTest(StandInHostTest):
+
+    def test_write_field(self):
+        self.session.WriteScreen("CASE", 16, 23)
+        self.assertEqual(self.session.ReadScreen(4, 16, 23), "CASE")
+
+    def test_write_protected_position_is_refused(self):
+        self.session.WriteScreen("X", 2, 30)
+        self.assertEqual(self.session.ReadScreen(4, 2, 30), "SELF")
+
+    def test_aid_key_and_wait_ready(self):
+        self.session.WriteScreen("STAT", 16, 23)
+        self.session.WriteScreen("12345678", 18, 23)
+        self.session.SendKey("<enter>")
+        self.session.WaitReady(0, 0)
+        self.assertEqual(self.session.ReadScreen(9, 2, 36), "STAT/MEMB")
+        self.assertEqual(self.session.ReadScreen(8, 4, 12), "12345678")
+
+    def test_error_message(self):
+        self.session.WriteScreen("XXXX", 16, 23)
+        self.session.Transmit()
+        self.assertEqual(self.session.ReadScreen(31, 24, 2), "ENTER A VALID COMMAND OR PF-KEY")
+
+
+class ReadModifiedTest(StandInHostTest):
+
+    def setUp(self):
+        self.inputs = []
+
+        def echo(state, key, fields):
+            self.inputs.append((key, fields))
+            return Panel(["", " Name: ________   Code: ___"], values={(2, 8): "PRESET"})
+
+        self.application = echo
+        super(ReadModifiedTest, self).setUp()
+
+    def test_only_modified_fields_are_sent(self):
+        self.session.WriteScreen("ABC", 2, 25)
+        self.session.Transmit()
+        key, fields = self.inputs[-1]
+        self.assertEqual(key, "<enter>")
+        self.assertEqual(fields, {(2, 25): "ABC"})
+
+    def test_unmodified_field_is_not_sent(self):
+        self.session.Transmit()
+        self.assertEqual(self.inputs[-1], ("<enter>", {}))
+
+    def test_pf_key(self):
+        self.session.WriteScreen("NEW", 2, 8)
+        self.session.SendKey("<pf5>")
+        self.session.WaitReady(0, 0)
+        key, fields = self.inputs[-1]
+        self.assertEqual(key, "<pf5>")
+        self.assertEqual(fields[(2, 8)][:3], "NEW")
+
+
+class PagingTest(StandInHostTest):
+
+    def open_case_note(self):
+        with self.session.write_batch(verify=False) as batch:
+            batch.write("CASE", 16, 23)
+            batch.write("1234", 18, 23)
+        self.assertEqual(self.session.ReadScreen(9, 2, 36), "CASE/NOTE")
+
+    def test_note_over_several_pages(self):
+        self.open_case_note()
+        note = CaseNote("Header")
+        for n in range(30):
+            note.item("Line %d" % n)
+        sent = NoteWriter(self.session).write(note)
+        # PF9 to open, PF8 twice to page, PF3 to save.
+        self.assertEqual(sent, 4)
+        self.assertEqual(self.session.ReadScreen(10, 24, 2), "NOTE SAVED")
+        self.assertEqual(self.session.ReadScreen(6, 6, 5), "Header")
+
+    def test_page_key_clears_the_page(self):
+        self.open_case_note()
+        self.session.SendKey("<pf9>")
+        self.session.WaitReady(0, 0)
+        self.session.WriteScreen("first page", 4, 3)
+        self.session.SendKey("<pf8>")
+        self.session.WaitReady(0, 0)
+        self.assertEqual(self.session.ReadScreen(10, 4, 3), "_" * 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+"""Tracing bzio calls."""
+
+import threading
+import unittest
+
+from bzio import trace
+from bzio.emulator import Emulator
+from bzio.session import Session
+
+
+class TraceTest(unittest.TestCase):
+
+    def setUp(self):
+        self.session = Session(backend=Emulator(["SELF"], latency=0.01))
+
+    def test_nested_calls_are_recorded_with_their_depth(self):
+        with trace.tracing() as tracer:
+            self.session.Transmit()
+            self.session.ReadScreen(4, 1, 1)
+        events = dict((event[0], event) for event in tracer.events)
+        self.assertEqual([(event[0], event[6]) for event in tracer.events],
+                         [("SendKey", 1), ("WaitReady", 1), ("Transmit", 0), ("ReadScreen", 0)])
+        transmit = events["Transmit"]
+        inner = events["SendKey"][2] + events["WaitReady"][2]
+        self.assertAlmostEqual(transmit[7], transmit[2] - inner)
+        self.assertLess(transmit[7], 0.01)
+
+    def test_summary_shows_self_and_total_time(self):
+        with trace.tracing() as tracer:
+            self.session.Transmit()
+        count, total, own, longest = tracer.totals["Transmit"]
+        self.assertEqual(count, 1)
+        self.assertLess(own, total)
+        self.assertIn("self ms", tracer.summary().splitlines()[0])
+
+    def test_each_thread_is_traced(self):
+        other = Session(backend=Emulator(["SELF"]))
+        with trace.tracing() as tracer:
+            thread = threading.Thread(target=other.Transmit)
+            thread.start()
+            thread.join()
+            self.session.Transmit()
+        self.assertEqual(tracer.totals["Transmit"][0], 2)
+        self.assertEqual(tracer.totals["WaitReady"][0], 2)
+        self.assertEqual(set(event[6] for event in tracer.events if event[0] == "Transmit"), set([0]))
+
+    def test_error_leaves_tracing_usable(self):
+        with trace.tracing() as tracer:
+            with self.assertRaises(ValueError):
+                self.session.ReadScreen(4, 25, 1)
+            self.session.SendKey("<enter>")
+        self.assertEqual([(event[0], event[6]) for event in tracer.events], [("ReadScreen", 0), ("SendKey", 0)])
+
+    def test_chrome_trace_nests_by_time(self):
+        with trace.tracing() as tracer:
+            self.session.Transmit()
+        events = tracer.chrome_trace()["traceEvents"]
+        outer = [event for event in events if event["name"] == "Transmit"][0]
+        for event in events:
+            self.assertGreaterEqual(event["ts"], outer["ts"])
+            self.assertLessEqual(event["ts"] + event["dur"], outer["ts"] + outer["dur"] + 1e-3)
+
+
+if __name__ == "__main__":
+    unittest.main()
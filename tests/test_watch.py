@@ -0,0 +1,39 @@
+"""ScreenWatcher polling an emulated screen."""
+
+import unittest
+
+from bzio.emulator import Emulator
+from bzio.session import Session
+from bzio.watch import ScreenWatcher
+
+
+class WatcherTest(unittest.TestCase):
+
+    def setUp(self):
+        self.emulator = Emulator(["SELF", "", "waiting"], cursor=(3, 1))
+        self.watcher = ScreenWatcher(Session(backend=self.emulator), rows=range(1, 24))
+
+    def test_unchanged_polls_read_only_the_text(self):
+        for _ in range(10):
+            self.assertIsNone(self.watcher.poll())
+        self.assertEqual(self.emulator.calls["read_screen"], 10)
+        self.assertEqual(self.emulator.calls["get_cursor"], 0)
+
+    def test_change(self):
+        self.watcher.poll()
+        self.emulator.load(["SELF", "", "done"], cursor=(5, 2))
+        change = self.watcher.poll()
+        self.assertEqual(change.rows, (3,))
+        self.assertEqual(change.screen.cursor, (5, 2))
+        self.assertEqual(self.emulator.calls["get_cursor"], 1)
+
+    def test_change_outside_watched_rows(self):
+        self.watcher.poll()
+        self.emulator.load(["SELF", "", "waiting"] + [""] * 20 + ["MESSAGE"])
+        self.assertIsNone(self.watcher.poll())
+        self.assertIsNone(self.watcher.poll())
+        self.assertEqual(self.emulator.calls["get_cursor"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()